@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 # Import the Base and all models
 from app.core.database import Base
 from app.core.config import settings
-from app.models import Workflow, Task, JobRun  # Import all models to register them
+from app.models import Workflow, Task, JobRun, TaskRun  # Import all models to register them
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
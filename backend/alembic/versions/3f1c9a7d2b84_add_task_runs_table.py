@@ -0,0 +1,45 @@
+"""Add task_runs table for per-task run state
+
+Revision ID: 3f1c9a7d2b84
+Revises: 2a3cef5e97c1
+Create Date: 2026-10-16 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b84'
+down_revision: Union[str, None] = '2a3cef5e97c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create task_runs table (one row per task per job run, latest try)
+    op.create_table(
+        'task_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('job_run_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('task_id', sa.String(length=255), nullable=False),
+        sa.Column('state', sa.String(length=50), nullable=True),
+        sa.Column('try_number', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('queued_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['job_run_id'], ['job_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_run_id', 'task_id', name='uq_task_runs_job_run_task')
+    )
+    op.create_index('ix_task_runs_state', 'task_runs', ['state'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_runs_state', table_name='task_runs')
+    op.drop_table('task_runs')
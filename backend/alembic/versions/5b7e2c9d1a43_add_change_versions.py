@@ -0,0 +1,82 @@
+"""Add per-table change versions for conditional GET
+
+Revision ID: 5b7e2c9d1a43
+Revises: 3f1c9a7d2b84
+Create Date: 2026-10-16 21:40:12.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d1a43'
+down_revision: Union[str, None] = '3f1c9a7d2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose changes invalidate API ETags
+VERSIONED_TABLES = ('workflows', 'tasks', 'job_runs')
+
+
+def upgrade() -> None:
+    # One monotonic counter per table, bumped in the writing transaction
+    op.create_table(
+        'change_versions',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute(
+        "INSERT INTO change_versions (table_name) VALUES "
+        + ", ".join(f"('{table}')" for table in VERSIONED_TABLES)
+    )
+
+    # Statement-level: a bulk UPDATE bumps once, and only if it touched rows
+    op.execute("""
+        CREATE FUNCTION bump_change_version() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM changed_rows) THEN
+                UPDATE change_versions SET version = version + 1
+                WHERE table_name = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # TRUNCATE triggers have no transition table to look at
+    op.execute("""
+        CREATE FUNCTION bump_change_version_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            UPDATE change_versions SET version = version + 1
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Transition tables allow only one event per trigger
+    for table in VERSIONED_TABLES:
+        for event, transition in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            op.execute(
+                f"CREATE TRIGGER {table}_{event.lower()}_change_version "
+                f"AFTER {event} ON {table} "
+                f"REFERENCING {transition} TABLE AS changed_rows "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version()"
+            )
+        op.execute(
+            f"CREATE TRIGGER {table}_truncate_change_version "
+            f"AFTER TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version_on_truncate()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        for event in ('insert', 'update', 'delete', 'truncate'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{event}_change_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_change_version_on_truncate()")
+    op.execute("DROP FUNCTION IF EXISTS bump_change_version()")
+    op.drop_table('change_versions')
@@ -0,0 +1,63 @@
+"""Add job_runs indexes for list, stats and reconciler queries
+
+Revision ID: 8d2f4b6a0c17
+Revises: 5b7e2c9d1a43
+Create Date: 2026-10-16 22:31:07.642915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b6a0c17'
+down_revision: Union[str, None] = '5b7e2c9d1a43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, but doesn't block writes
+    # to job_runs while large tables are indexed
+    with op.get_context().autocommit_block():
+        # list_job_runs?workflow_id=... ORDER BY created_at DESC
+        op.create_index(
+            'ix_job_runs_workflow_id_created_at', 'job_runs',
+            ['workflow_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # list_job_runs?status_filter=... ORDER BY created_at DESC, stats by status
+        op.create_index(
+            'ix_job_runs_status_created_at', 'job_runs',
+            ['status', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Unfiltered list ordering and the stats 24h window
+        op.create_index(
+            'ix_job_runs_created_at', 'job_runs',
+            [sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+        # Reconciler scan of runs that can still change; stays small as runs finish
+        op.create_index(
+            'ix_job_runs_pending', 'job_runs',
+            ['created_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("status IN ('queued', 'running')")
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name in (
+            'ix_job_runs_pending',
+            'ix_job_runs_created_at',
+            'ix_job_runs_status_created_at',
+            'ix_job_runs_workflow_id_created_at',
+        ):
+            op.drop_index(
+                index_name, table_name='job_runs',
+                postgresql_concurrently=True, if_exists=True
+            )
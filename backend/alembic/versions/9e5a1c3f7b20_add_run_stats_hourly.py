@@ -0,0 +1,113 @@
+"""Add run_stats_hourly rollup of job run counts
+
+Revision ID: 9e5a1c3f7b20
+Revises: 8d2f4b6a0c17
+Create Date: 2026-10-16 23:05:48.370116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e5a1c3f7b20'
+down_revision: Union[str, None] = '8d2f4b6a0c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Add signed per-bucket deltas from a transition table query
+UPSERT_DELTAS = """
+    INSERT INTO run_stats_hourly AS s (bucket, workflow_id, status, run_count)
+    SELECT bucket, workflow_id, status, SUM(delta)
+    FROM ({deltas}) d
+    GROUP BY bucket, workflow_id, status
+    HAVING SUM(delta) <> 0
+    ON CONFLICT (bucket, workflow_id, status)
+    DO UPDATE SET run_count = s.run_count + EXCLUDED.run_count
+"""
+
+ROW_DELTA = "SELECT date_trunc('hour', created_at) AS bucket, workflow_id, status, {sign} AS delta FROM {rows}"
+
+
+def upgrade() -> None:
+    # Job run counts per creation hour, workflow and current status
+    op.create_table(
+        'run_stats_hourly',
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('workflow_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('run_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket', 'workflow_id', 'status')
+    )
+
+    # Statement-level, so a bulk status UPDATE folds into one upsert
+    op.execute(f"""
+        CREATE FUNCTION run_stats_on_insert() RETURNS trigger AS $$
+        BEGIN
+            {UPSERT_DELTAS.format(deltas=ROW_DELTA.format(sign=1, rows='new_rows'))};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE FUNCTION run_stats_on_update() RETURNS trigger AS $$
+        BEGIN
+            {UPSERT_DELTAS.format(deltas=ROW_DELTA.format(sign=1, rows='new_rows') + ' UNION ALL ' + ROW_DELTA.format(sign=-1, rows='old_rows'))};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE FUNCTION run_stats_on_delete() RETURNS trigger AS $$
+        BEGIN
+            {UPSERT_DELTAS.format(deltas=ROW_DELTA.format(sign=-1, rows='old_rows'))};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION run_stats_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            TRUNCATE run_stats_hourly;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute(
+        "CREATE TRIGGER job_runs_insert_run_stats AFTER INSERT ON job_runs "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_insert()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_update_run_stats AFTER UPDATE ON job_runs "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_update()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_delete_run_stats AFTER DELETE ON job_runs "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_delete()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_truncate_run_stats AFTER TRUNCATE ON job_runs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_truncate()"
+    )
+
+    # Backfill from existing runs (the triggers cover everything after this)
+    op.execute("""
+        INSERT INTO run_stats_hourly (bucket, workflow_id, status, run_count)
+        SELECT date_trunc('hour', created_at), workflow_id, status, COUNT(*)
+        FROM job_runs
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete', 'truncate'):
+        op.execute(f"DROP TRIGGER IF EXISTS job_runs_{event}_run_stats ON job_runs")
+        op.execute(f"DROP FUNCTION IF EXISTS run_stats_on_{event}()")
+    op.drop_table('run_stats_hourly')
@@ -0,0 +1,148 @@
+"""Partition job_runs by month on created_at
+
+Revision ID: b41d7e9c2f58
+Revises: 9e5a1c3f7b20
+Create Date: 2026-10-17 00:14:26.905331
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d7e9c2f58'
+down_revision: Union[str, None] = '9e5a1c3f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created past the current one (the maintenance job keeps extending this)
+PARTITIONS_AHEAD = 3
+
+COLUMNS = 'id, workflow_id, dag_run_id, status, triggered_by, started_at, ended_at, logs, created_at'
+
+
+def job_runs_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('workflow_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('dag_run_id', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('triggered_by', sa.String(length=100), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('logs', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def create_hot_path_indexes() -> None:
+    # Same indexes as 8d2f4b6a0c17; on a partitioned table they cascade to every partition
+    op.create_index('ix_job_runs_workflow_id_created_at', 'job_runs', ['workflow_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_job_runs_status_created_at', 'job_runs', ['status', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_job_runs_created_at', 'job_runs', [sa.text('created_at DESC')], unique=False)
+    op.create_index(
+        'ix_job_runs_pending', 'job_runs', ['created_at'], unique=False,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+
+
+def create_triggers() -> None:
+    # Triggers from 5b7e2c9d1a43 (change versions) and 9e5a1c3f7b20 (run stats rollup)
+    for event, transition in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        op.execute(
+            f"CREATE TRIGGER job_runs_{event.lower()}_change_version "
+            f"AFTER {event} ON job_runs "
+            f"REFERENCING {transition} TABLE AS changed_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version()"
+        )
+    op.execute(
+        "CREATE TRIGGER job_runs_truncate_change_version AFTER TRUNCATE ON job_runs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_change_version_on_truncate()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_insert_run_stats AFTER INSERT ON job_runs "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_insert()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_update_run_stats AFTER UPDATE ON job_runs "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_update()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_delete_run_stats AFTER DELETE ON job_runs "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_delete()"
+    )
+    op.execute(
+        "CREATE TRIGGER job_runs_truncate_run_stats AFTER TRUNCATE ON job_runs "
+        "FOR EACH STATEMENT EXECUTE FUNCTION run_stats_on_truncate()"
+    )
+
+
+def upgrade() -> None:
+    # A foreign key into a partitioned table must include the partition key;
+    # task_runs rows are removed by the maintenance job with their partition instead
+    op.drop_constraint('task_runs_job_run_id_fkey', 'task_runs', type_='foreignkey')
+
+    op.create_table(
+        'job_runs_partitioned',
+        *job_runs_columns(),
+        postgresql_partition_by='RANGE (created_at)'
+    )
+
+    # One partition per month from the oldest run through PARTITIONS_AHEAD months ahead
+    now = datetime.utcnow()
+    oldest = op.get_bind().execute(sa.text("SELECT MIN(created_at) FROM job_runs")).scalar() or now
+    month = datetime(oldest.year, oldest.month, 1)
+    last = add_months(datetime(now.year, now.month, 1), PARTITIONS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE job_runs_p{month:%Y%m} PARTITION OF job_runs_partitioned "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE job_runs_default PARTITION OF job_runs_partitioned DEFAULT")
+
+    # Copy before creating triggers and indexes: the rollup already counts these rows
+    op.execute(f"INSERT INTO job_runs_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM job_runs")
+    op.drop_table('job_runs')
+    op.rename_table('job_runs_partitioned', 'job_runs')
+
+    # Unique keys must include created_at, so dag_run_id is indexed but no longer unique
+    op.create_primary_key('job_runs_pkey', 'job_runs', ['id', 'created_at'])
+    op.create_foreign_key('job_runs_workflow_id_fkey', 'job_runs', 'workflows', ['workflow_id'], ['id'])
+    op.create_index('ix_job_runs_dag_run_id', 'job_runs', ['dag_run_id'], unique=False)
+    create_hot_path_indexes()
+    create_triggers()
+
+
+def downgrade() -> None:
+    op.create_table('job_runs_unpartitioned', *job_runs_columns())
+    op.execute(f"INSERT INTO job_runs_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM job_runs")
+
+    # Dropping the parent drops every partition (archived months are not restored)
+    op.drop_table('job_runs')
+    op.rename_table('job_runs_unpartitioned', 'job_runs')
+
+    op.create_primary_key('job_runs_pkey', 'job_runs', ['id'])
+    op.create_unique_constraint('job_runs_dag_run_id_key', 'job_runs', ['dag_run_id'])
+    op.create_foreign_key('job_runs_workflow_id_fkey', 'job_runs', 'workflows', ['workflow_id'], ['id'])
+    op.create_index('ix_job_runs_dag_run_id', 'job_runs', ['dag_run_id'], unique=True)
+    create_hot_path_indexes()
+    create_triggers()
+
+    op.execute("DELETE FROM task_runs WHERE job_run_id NOT IN (SELECT id FROM job_runs)")
+    op.create_foreign_key(
+        'task_runs_job_run_id_fkey', 'task_runs', 'job_runs',
+        ['job_run_id'], ['id'], ondelete='CASCADE'
+    )
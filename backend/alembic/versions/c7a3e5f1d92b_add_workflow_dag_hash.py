@@ -0,0 +1,28 @@
+"""Record the content hash of each workflow's published DAG file
+
+Revision ID: c7a3e5f1d92b
+Revises: b41d7e9c2f58
+Create Date: 2026-10-17 02:41:09.518224
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a3e5f1d92b'
+down_revision: Union[str, None] = 'b41d7e9c2f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the rendered DAG code, also written in the file's first line;
+    # NULL until the workflow is deployed again
+    op.add_column('workflows', sa.Column('dag_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('workflows', 'dag_hash')
@@ -0,0 +1,38 @@
+"""Add the workflows index for newest-first list paging
+
+Revision ID: f2b8d4a6c9e1
+Revises: e4a9c2d7f1b6
+Create Date: 2026-10-17 05:02:37.914260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c9e1'
+down_revision: Union[str, None] = 'e4a9c2d7f1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, but doesn't block writes
+    # to workflows while the index is built
+    with op.get_context().autocommit_block():
+        # list_workflows ORDER BY created_at DESC, id DESC and its cursor filter
+        op.create_index(
+            'ix_workflows_created_at_id', 'workflows',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_workflows_created_at_id', table_name='workflows',
+            postgresql_concurrently=True, if_exists=True
+        )
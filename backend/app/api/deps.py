@@ -1,9 +1,10 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal, SessionLocal
 from app.core.config import settings
-from app.services.airflow_client import AirflowClient
-from app.services.dag_generator import DAGGenerator
+from app.services.airflow_client import AirflowClient, init_airflow_client
+from app.services.dag_generator import DAGGenerator, init_dag_generator
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -17,15 +18,27 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session (for async endpoints)
+
+    The session checks out a connection on first use and returns it on
+    commit, rollback or close; close it before awaiting Airflow so the
+    connection isn't held for the duration of the call.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_airflow_client() -> AirflowClient:
     """
-    Dependency to get Airflow client
+    Dependency to get the shared Airflow client (pooled connections)
     """
-    return AirflowClient()
+    return init_airflow_client()
 
 
 def get_dag_generator() -> DAGGenerator:
     """
-    Dependency to get DAG generator
+    Dependency to get the shared DAG generator (compiled template cached)
     """
-    return DAGGenerator(dags_folder=settings.DAGS_FOLDER)
+    return init_dag_generator(settings.DAGS_FOLDER, settings.DAG_TEMPLATE_CACHE_DIR, settings.DAG_DEPLOY_MODE)
@@ -1,27 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query as OrmQuery, Session
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from app.api.deps import get_db, get_airflow_client
+from app.api.deps import get_async_db, get_db, get_airflow_client
 from app.models.workflow import Workflow
 from app.models.job_run import JobRun
+from app.models.task_run import TaskRun
+from app.core.config import settings
 from app.schemas.job_run import JobRunResponse, JobRunListResponse
+from app.schemas.run_event import RunStateEventBatch, RunStateEventResult
+from app.schemas.task_run import TaskRunListResponse
 from app.services.airflow_client import AirflowClient
+from app.services.airflow_metadata import get_airflow_metadata
+from app.services.change_feed import change_feed
+from app.services.etag import etag_headers, etag_matches, get_table_versions, make_etag, not_modified
+from app.services.pagination import paginate
+from app.services.resilience import AirflowUnavailableError
+from app.services.run_events import ingest_run_events
+from app.services.run_reconciler import fetch_dag_runs, get_run_reconciler, sync_job_runs
+from app.services.run_waiters import run_waiters
+from app.services.task_runs import bulk_upsert_task_runs, fetch_task_run_rows
+from app.services.run_updates import (
+    NON_TERMINAL_STATES,
+    apply_run_update,
+    bulk_apply_run_updates,
+    publish_run_event,
+    publish_status_changes,
+    run_update_from_airflow,
+)
 
 router = APIRouter()
 
 
+def job_runs_query(
+    db: Session,
+    workflow_id: Optional[UUID] = None,
+    status_filter: Optional[str] = None
+) -> OrmQuery:
+    """Job runs matching the list_job_runs filters (unordered; paginate orders them)"""
+    query = db.query(JobRun)
+
+    if workflow_id:
+        query = query.filter(JobRun.workflow_id == workflow_id)
+
+    if status_filter:
+        query = query.filter(JobRun.status == status_filter)
+
+    return query
+
+
 @router.post("/trigger/{workflow_id}", response_model=JobRunResponse)
 async def trigger_workflow(
     workflow_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Trigger a workflow execution"""
     # Get workflow
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    workflow = await db.get(Workflow, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,6 +79,9 @@ async def trigger_workflow(
             detail="Cannot trigger inactive workflow"
         )
 
+    # Return the connection to the pool while waiting on Airflow
+    await db.close()
+
     # Trigger DAG in Airflow
     dag_id = f"workflow_{workflow_id}"
     try:
@@ -60,11 +108,17 @@ async def trigger_workflow(
             started_at=datetime.utcnow()
         )
         db.add(job_run)
-        db.commit()
-        db.refresh(job_run)
+        await db.commit()
+        await db.refresh(job_run)
+        publish_run_event("run.created", job_run)
 
         return job_run
 
+    except AirflowUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to trigger workflow: Airflow is unavailable ({str(e)})"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -72,127 +126,333 @@ async def trigger_workflow(
         )
 
 
+@router.post("/events", response_model=RunStateEventResult)
+def ingest_run_state_events(
+    batch: RunStateEventBatch,
+    x_events_token: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Ingest run state changes pushed by the Airflow listener plugin
+
+    DAG run events update the matching job runs in one bulk query.
+    """
+    if settings.RUN_EVENTS_TOKEN and x_events_token != settings.RUN_EVENTS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid events token"
+        )
+
+    updated = ingest_run_events(db, batch.events)
+
+    reconciler = get_run_reconciler()
+    if reconciler:
+        reconciler.note_push_event()
+
+    dag_run_events = sum(1 for event in batch.events if event.type == "dag_run")
+    return RunStateEventResult(
+        received=len(batch.events),
+        dag_run_events=dag_run_events,
+        task_instance_events=len(batch.events) - dag_run_events,
+        job_runs_updated=updated
+    )
+
+
 @router.get("/", response_model=JobRunListResponse)
 async def list_job_runs(
+    response: Response,
     workflow_id: Optional[UUID] = None,
     status_filter: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    exact_total: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
-    """List job runs with optional filtering and sync status from Airflow"""
-    query = db.query(JobRun)
-
-    if workflow_id:
-        query = query.filter(JobRun.workflow_id == workflow_id)
-
-    if status_filter:
-        query = query.filter(JobRun.status == status_filter)
-
-    total = query.count()
-    job_runs = query.order_by(JobRun.created_at.desc()).offset(skip).limit(limit).all()
+    """
+    List job runs with optional filtering, newest first
+
+    Pass next_cursor from the previous page as cursor to page without an
+    offset scan (skip is still accepted). total is a planner estimate unless
+    exact_total is set.
+
+    Status is kept in sync by the background reconciler; if it is disabled,
+    running job runs are synced from Airflow here (and no ETag is sent, since
+    the response then depends on Airflow state at request time).
+    """
+    if get_run_reconciler() is not None:
+        versions = await db.run_sync(get_table_versions, ["job_runs"])
+        if versions is not None:
+            etag = make_etag(versions, workflow_id, status_filter, skip, limit, cursor, exact_total)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            response.headers.update(etag_headers(etag))
+
+    def read_page(sync_db: Session):
+        query = job_runs_query(sync_db, workflow_id, status_filter)
+        return paginate(sync_db, query, JobRun, limit, cursor=cursor, skip=skip, exact_total=exact_total)
 
-    # Sync status from Airflow for each job run
-    for job_run in job_runs:
-        if job_run.dag_run_id and job_run.status == "running":
-            try:
-                dag_id = f"workflow_{job_run.workflow_id}"
-                airflow_run = await airflow.get_dag_run(dag_id, job_run.dag_run_id)
+    try:
+        page = await db.run_sync(read_page)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    job_runs = page.items
 
-                # Update status
-                airflow_state = airflow_run.get("state", "").lower()
-                if airflow_state in ["success", "failed", "running"]:
-                    job_run.status = airflow_state
+    # Detach the page (loaded values stay readable) and release the connection
+    await db.close()
 
-                # Update timestamps
-                if airflow_run.get("start_date"):
-                    job_run.started_at = datetime.fromisoformat(
-                        airflow_run["start_date"].replace("Z", "+00:00")
-                    )
-                if airflow_run.get("end_date"):
-                    job_run.ended_at = datetime.fromisoformat(
-                        airflow_run["end_date"].replace("Z", "+00:00")
+    # Without the background reconciler, sync running job runs in one batch request
+    running = [jr for jr in job_runs if jr.dag_run_id and jr.status == "running"]
+    if running and get_run_reconciler() is None:
+        try:
+            runs_by_key = await fetch_dag_runs(airflow, running)
+            updates = {}
+            for job_run in running:
+                airflow_run = runs_by_key.get(
+                    (f"workflow_{job_run.workflow_id}", job_run.dag_run_id)
+                )
+                if airflow_run:
+                    updates[job_run.id] = run_update_from_airflow(
+                        job_run.id, job_run.status, airflow_run
                     )
 
-                db.commit()
+            if updates:
+                # One UPDATE ... FROM (VALUES ...) for the whole page
+                changed = await db.run_sync(bulk_apply_run_updates, list(updates.values()))
+                await db.commit()
+                publish_status_changes(changed, {jr.id: jr.status for jr in running})
+                for job_run in running:
+                    if job_run.id in updates:
+                        apply_run_update(job_run, updates[job_run.id])
 
-            except Exception as e:
-                # If Airflow request fails, just keep current state
-                print(f"Failed to sync job run {job_run.id} status from Airflow: {e}")
-
-    # Refresh all job runs to get updated data
-    for job_run in job_runs:
-        db.refresh(job_run)
+        except Exception as e:
+            # If Airflow request fails, just keep current state
+            await db.rollback()
+            print(f"Failed to sync job run statuses from Airflow: {e}")
 
     return JobRunListResponse(
-        total=total,
+        total=page.total,
         job_runs=job_runs,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit
+        page=skip // limit + 1 if limit > 0 and not cursor else 1,
+        page_size=limit,
+        total_is_estimate=page.total_is_estimate,
+        next_cursor=page.next_cursor
+    )
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    workflow_id: Optional[UUID] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream job run and workflow changes as Server-Sent Events
+
+    Events: run.created, run.status_changed, workflow.paused, workflow.unpaused.
+    Reconnecting clients send Last-Event-ID to resume; a "reset" event means
+    events were missed and the client should refetch.
+    """
+    workflow_filter = str(workflow_id) if workflow_id else None
+
+    async def event_stream():
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        async for event in change_feed.subscribe(
+            last_event_id,
+            heartbeat=settings.CHANGE_FEED_HEARTBEAT
+        ):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if workflow_filter and event.data.get("workflow_id") not in (None, workflow_filter):
+                continue
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Don't let nginx buffer the stream
+            "X-Accel-Buffering": "no",
+        }
     )
 
 
 @router.get("/{job_run_id}", response_model=JobRunResponse)
 async def get_job_run(
     job_run_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
-    """Get job run details and sync status from Airflow"""
-    job_run = db.query(JobRun).filter(JobRun.id == job_run_id).first()
+    """
+    Get job run details
+
+    Status is kept in sync by the background reconciler; if it is disabled,
+    the job run is synced from Airflow here.
+    """
+    if get_run_reconciler() is not None:
+        versions = await db.run_sync(get_table_versions, ["job_runs"])
+        if versions is not None:
+            etag = make_etag(versions, job_run_id)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            response.headers.update(etag_headers(etag))
+
+    job_run = await db.get(JobRun, job_run_id)
     if not job_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job run {job_run_id} not found"
         )
 
-    # Sync status from Airflow
-    if job_run.dag_run_id:
+    # Detach the job run and release the connection
+    await db.close()
+
+    # Without the background reconciler, sync status from Airflow
+    if job_run.dag_run_id and get_run_reconciler() is None:
         try:
             dag_id = f"workflow_{job_run.workflow_id}"
-            airflow_run = await airflow.get_dag_run(dag_id, job_run.dag_run_id)
-
-            # Update status
-            airflow_state = airflow_run.get("state", "").lower()
-            if airflow_state in ["success", "failed", "running"]:
-                job_run.status = airflow_state
-
-            # Update timestamps
-            if airflow_run.get("start_date"):
-                job_run.started_at = datetime.fromisoformat(
-                    airflow_run["start_date"].replace("Z", "+00:00")
-                )
-            if airflow_run.get("end_date"):
-                job_run.ended_at = datetime.fromisoformat(
-                    airflow_run["end_date"].replace("Z", "+00:00")
-                )
+            if get_airflow_metadata() is not None:
+                runs_by_key = await fetch_dag_runs(airflow, [job_run])
+                airflow_run = runs_by_key.get((dag_id, job_run.dag_run_id))
+            else:
+                airflow_run = await airflow.get_dag_run(dag_id, job_run.dag_run_id)
 
-            db.commit()
-            db.refresh(job_run)
+            if airflow_run:
+                run_update = run_update_from_airflow(job_run.id, job_run.status, airflow_run)
+                changed = await db.run_sync(bulk_apply_run_updates, [run_update])
+                await db.commit()
+                publish_status_changes(changed, {job_run.id: job_run.status})
+                apply_run_update(job_run, run_update)
 
         except Exception as e:
             # If Airflow request fails, just return current state
+            await db.rollback()
             print(f"Failed to sync job run status from Airflow: {e}")
 
     return job_run
 
 
+@router.get("/{job_run_id}/wait", response_model=JobRunResponse)
+async def wait_for_job_run(
+    job_run_id: UUID,
+    until: str = Query("terminal", pattern="^(terminal|change)$"),
+    timeout: float = Query(30.0, gt=0, le=settings.JOB_WAIT_MAX_TIMEOUT),
+    db: AsyncSession = Depends(get_async_db),
+    airflow: AirflowClient = Depends(get_airflow_client)
+):
+    """
+    Wait for a job run to finish (until=terminal) or change status (until=change)
+
+    Holds the request open for up to ``timeout`` seconds and returns as soon
+    as the run's state is published. On timeout the current job run is
+    returned; callers check its status and wait again.
+    """
+    # Without the background reconciler, one shared poller per run checks Airflow
+    poll = None
+    if get_run_reconciler() is None:
+        poll = partial(sync_job_runs, airflow, [job_run_id])
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    initial_status = None
+
+    with run_waiters.watch(job_run_id, poll=poll):
+        while True:
+            changed = run_waiters.changed(job_run_id)
+            job_run = await db.get(JobRun, job_run_id)
+            if not job_run:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Job run {job_run_id} not found"
+                )
+
+            if initial_status is None:
+                initial_status = job_run.status
+            if until == "terminal" and job_run.status not in NON_TERMINAL_STATES:
+                return job_run
+            if until == "change" and job_run.status != initial_status:
+                return job_run
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return job_run
+
+            # Don't hold a pooled connection while parked (closing also
+            # empties the identity map, so the next get re-reads the row)
+            await db.close()
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+
+
+@router.get("/{job_run_id}/tasks", response_model=TaskRunListResponse)
+async def get_job_run_tasks(
+    job_run_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    airflow: AirflowClient = Depends(get_airflow_client)
+):
+    """
+    Get per-task state, duration and try number for a job run
+
+    Task runs are kept in sync by the background reconciler and the Airflow
+    listener; if the reconciler is disabled, they are synced from Airflow here.
+    """
+    job_run = await db.get(JobRun, job_run_id)
+    if not job_run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job run {job_run_id} not found"
+        )
+
+    if job_run.dag_run_id and get_run_reconciler() is None:
+        # Detach the job run and release the connection while waiting on Airflow
+        await db.close()
+        try:
+            rows = await fetch_task_run_rows(airflow, [job_run])
+            await db.run_sync(bulk_upsert_task_runs, rows)
+            await db.commit()
+        except Exception as e:
+            # If Airflow request fails, just return stored state
+            await db.rollback()
+            print(f"Failed to sync task runs from Airflow: {e}")
+
+    task_runs = (await db.execute(
+        select(TaskRun).where(
+            TaskRun.job_run_id == job_run_id
+        ).order_by(TaskRun.started_at.asc().nulls_last(), TaskRun.task_id)
+    )).scalars().all()
+
+    return TaskRunListResponse(job_run_id=job_run_id, task_runs=task_runs)
+
+
 @router.get("/{job_run_id}/logs/{task_name}")
 async def get_task_logs(
     job_run_id: UUID,
     task_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Get logs for a specific task in a job run"""
-    job_run = db.query(JobRun).filter(JobRun.id == job_run_id).first()
+    job_run = await db.get(JobRun, job_run_id)
     if not job_run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job run {job_run_id} not found"
         )
 
+    # Detach the job run and release the connection before calling Airflow
+    await db.close()
+
     if not job_run.dag_run_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -209,6 +469,11 @@ async def get_task_logs(
 
         return {"task_name": task_name, "logs": logs}
 
+    except AirflowUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to retrieve logs: Airflow is unavailable ({str(e)})"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,45 +1,69 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from sqlalchemy import text
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
 
-from app.api.deps import get_db, get_airflow_client
-from app.models.job_run import JobRun
+from app.api.deps import get_async_db, get_db, get_airflow_client
+from app.core.database import async_engine, engine
+from app.core.db_telemetry import pool_stats
 from app.models.workflow import Workflow
 from app.services.airflow_client import AirflowClient
+from app.services.change_feed import change_feed
+from app.services.deploys import deploy_manager
+from app.services.etag import get_change_version_compactor
+from app.services.partition_maintenance import get_partition_maintainer
+from app.services.run_reconciler import get_run_reconciler
+from app.services.run_stats import count_runs_by_status, window_start
+from app.services.run_waiters import run_waiters
 
 router = APIRouter()
 
 
+WINDOW_UNITS = {"h": "hours", "d": "days"}
+
+
+def _summarize(by_status: Dict[str, int]) -> Dict[str, Any]:
+    """Total, status breakdown and success rate for a set of status counts"""
+    success_count = by_status.get("success", 0)
+    failed_count = by_status.get("failed", 0)
+    total_completed = success_count + failed_count
+    success_rate = (success_count / total_completed * 100) if total_completed > 0 else 0
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "success_rate": round(success_rate, 2)
+    }
+
+
 @router.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
-    """Get workflow execution statistics"""
+def get_stats(
+    window: str = Query("24h", pattern=r"^[1-9][0-9]{0,3}[hd]$"),
+    workflow_id: Optional[UUID] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get workflow execution statistics
+
+    Run counts come from the hourly rollup, so windows (e.g. 1h, 24h, 7d)
+    are aligned to the hour. workflow_id restricts the job run counts.
+    """
     # Total workflows
     total_workflows = db.query(Workflow).count()
     active_workflows = db.query(Workflow).filter(Workflow.is_active == True).count()
 
-    # Total job runs
-    total_runs = db.query(JobRun).count()
+    # Job runs by status (all time)
+    all_time = _summarize(count_runs_by_status(db, workflow_id=workflow_id))
 
-    # Job runs by status
-    status_counts = db.query(
-        JobRun.status,
-        func.count(JobRun.id)
-    ).group_by(JobRun.status).all()
+    # Recent runs (last 24 hours) and the requested window
+    last_24h = window_start(timedelta(hours=24))
+    recent = count_runs_by_status(db, since=last_24h, workflow_id=workflow_id)
 
-    status_breakdown = {status: count for status, count in status_counts}
-
-    # Recent runs (last 24 hours)
-    last_24h = datetime.utcnow() - timedelta(hours=24)
-    recent_runs = db.query(JobRun).filter(
-        JobRun.created_at >= last_24h
-    ).count()
-
-    # Success rate
-    success_count = status_breakdown.get("success", 0)
-    failed_count = status_breakdown.get("failed", 0)
-    total_completed = success_count + failed_count
-    success_rate = (success_count / total_completed * 100) if total_completed > 0 else 0
+    window_delta = timedelta(**{WINDOW_UNITS[window[-1]]: int(window[:-1])})
+    since = window_start(window_delta)
+    windowed = recent if since == last_24h else count_runs_by_status(db, since=since, workflow_id=workflow_id)
 
     return {
         "workflows": {
@@ -48,27 +72,34 @@ def get_stats(db: Session = Depends(get_db)):
             "inactive": total_workflows - active_workflows
         },
         "job_runs": {
-            "total": total_runs,
-            "recent_24h": recent_runs,
-            "by_status": status_breakdown,
-            "success_rate": round(success_rate, 2)
+            "total": all_time["total"],
+            "recent_24h": sum(recent.values()),
+            "by_status": all_time["by_status"],
+            "success_rate": all_time["success_rate"],
+            "window": {
+                "range": window,
+                "since": since.isoformat(),
+                **_summarize(windowed)
+            }
         }
     }
 
 
 @router.get("/health")
 async def health_check(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """System health check"""
     # Check database
     db_healthy = False
     try:
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         db_healthy = True
     except Exception:
         pass
+    finally:
+        await db.close()
 
     # Check Airflow
     airflow_healthy = await airflow.health_check()
@@ -80,3 +111,28 @@ async def health_check(
             "airflow": "healthy" if airflow_healthy else "unhealthy"
         }
     }
+
+
+@router.get("/metrics")
+def get_metrics(airflow: AirflowClient = Depends(get_airflow_client)):
+    """Get in-process performance counters"""
+    reconciler = get_run_reconciler()
+    maintainer = get_partition_maintainer()
+    compactor = get_change_version_compactor()
+    return {
+        "database": {
+            "sync_pool": pool_stats(engine),
+            "async_pool": pool_stats(async_engine.sync_engine),
+        },
+        "run_reconciler": reconciler.stats() if reconciler else None,
+        "partition_maintenance": maintainer.stats() if maintainer else None,
+        "change_versions": compactor.stats() if compactor else None,
+        "deploys": deploy_manager.stats(),
+        "change_feed": change_feed.stats(),
+        "run_waiters": run_waiters.stats(),
+        "airflow": {
+            "dag_cache": airflow.dag_cache.stats(),
+            "circuit_breaker": airflow.breaker.stats(),
+            "singleflight": airflow.singleflight.stats(),
+        }
+    }
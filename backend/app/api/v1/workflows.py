@@ -1,21 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, status, UploadFile, File
 from fastapi.responses import Response
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from uuid import UUID
 
-from app.api.deps import get_db, get_dag_generator, get_airflow_client
+from app.api.deps import get_async_db, get_db, get_dag_generator, get_airflow_client
 from app.models.workflow import Workflow
 from app.models.task import Task
+from app.models.job_run import JobRun
 from app.schemas.workflow import (
     WorkflowCreate,
     WorkflowUpdate,
     WorkflowResponse,
     WorkflowListResponse,
+    WorkflowOverviewResponse,
 )
+from app.schemas.deploy import DagVerifyResponse, DeployResponse
 from app.services.dag_generator import DAGGenerator
+from app.services.deploys import deploy_manager
 from app.services.yaml_service import YAMLWorkflowService
 from app.services.airflow_client import AirflowClient
+from app.services.resilience import AirflowUnavailableError
+from app.services.change_feed import change_feed
+from app.services.etag import etag_headers, etag_matches, get_table_versions, make_etag, not_modified
+from app.services.pagination import paginate
+from app.services.run_stats import count_runs_by_status
 
 router = APIRouter()
 
@@ -45,47 +57,84 @@ def create_workflow(
 
 @router.get("/", response_model=WorkflowListResponse)
 async def list_workflows(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    exact_total: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
-    """List all workflows with pagination and Airflow pause status"""
-    total = db.query(Workflow).count()
-    workflows = db.query(Workflow).offset(skip).limit(limit).all()
+    """
+    List all workflows with pagination and Airflow pause status, newest first
+
+    Pass next_cursor from the previous page as cursor to page without an
+    offset scan (skip is still accepted). total is a planner estimate unless
+    exact_total is set.
+
+    Supports If-None-Match: the ETag covers the workflows table version and
+    the (cached) Airflow pause states.
+    """
+    # Fetch pause status for all workflow DAGs from Airflow (served from the DAG cache)
+    # before checking out a database connection
+    try:
+        dags = await airflow.list_dags(dag_id_pattern="workflow_")
+    except Exception as e:
+        print(f"Failed to list DAGs from Airflow: {e}")
+        dags = {}
+
+    versions = await db.run_sync(get_table_versions, ["workflows"])
+    if versions is not None:
+        paused = sorted((dag_id, dag.get("is_paused")) for dag_id, dag in dags.items())
+        etag = make_etag(versions, paused, skip, limit, cursor, exact_total)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+
+    try:
+        page = await db.run_sync(
+            lambda sync_db: paginate(
+                sync_db, sync_db.query(Workflow), Workflow, limit,
+                cursor=cursor, skip=skip, exact_total=exact_total
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    workflows = page.items
 
-    # Fetch pause status from Airflow for each workflow
     for workflow in workflows:
-        dag_id = f"workflow_{workflow.id}"
-        try:
-            dag_info = await airflow.get_dag(dag_id)
-            workflow.is_paused_in_airflow = dag_info.get("is_paused", None)
-        except Exception as e:
-            # If DAG doesn't exist or error occurs, set to None
-            workflow.is_paused_in_airflow = None
+        # If DAG doesn't exist or error occurs, set to None
+        dag_info = dags.get(f"workflow_{workflow.id}", {})
+        workflow.is_paused_in_airflow = dag_info.get("is_paused", None)
 
     return WorkflowListResponse(
-        total=total,
+        total=page.total,
         workflows=workflows,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit
+        page=skip // limit + 1 if limit > 0 and not cursor else 1,
+        page_size=limit,
+        total_is_estimate=page.total_is_estimate,
+        next_cursor=page.next_cursor
     )
 
 
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow(
     workflow_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Get workflow by ID with Airflow pause status"""
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    workflow = await db.get(Workflow, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Workflow {workflow_id} not found"
         )
 
+    # Detach the workflow and release the connection before calling Airflow
+    await db.close()
+
     # Fetch pause status from Airflow
     dag_id = f"workflow_{workflow.id}"
     try:
@@ -97,6 +146,68 @@ async def get_workflow(
     return workflow
 
 
+@router.get("/{workflow_id}/overview", response_model=WorkflowOverviewResponse)
+async def get_workflow_overview(
+    workflow_id: UUID,
+    response: Response,
+    runs_limit: int = Query(10, ge=0, le=100),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    airflow: AirflowClient = Depends(get_airflow_client)
+):
+    """
+    Get everything the workflow detail page shows in one request
+
+    Returns the workflow with its Airflow pause status (from the DAG cache),
+    its tasks, the latest runs_limit job runs and job run counts per status.
+    """
+    # Pause status first, so no database connection is held while Airflow answers
+    dag_id = f"workflow_{workflow_id}"
+    try:
+        dag_info = await airflow.get_dag(dag_id)
+        is_paused = dag_info.get("is_paused", None)
+    except Exception:
+        is_paused = None
+
+    versions = await db.run_sync(get_table_versions, ["workflows", "tasks", "job_runs"])
+    if versions is not None:
+        etag = make_etag(versions, workflow_id, runs_limit, is_paused, "overview")
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+
+    result = await db.execute(
+        select(Workflow).options(selectinload(Workflow.tasks)).where(Workflow.id == workflow_id)
+    )
+    workflow = result.scalar_one_or_none()
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow {workflow_id} not found"
+        )
+
+    # Latest runs only: one range scan of (workflow_id, created_at DESC), not every run
+    recent_runs = []
+    if runs_limit > 0:
+        result = await db.execute(
+            select(JobRun)
+            .where(JobRun.workflow_id == workflow_id)
+            .order_by(JobRun.created_at.desc(), JobRun.id.desc())
+            .limit(runs_limit)
+        )
+        recent_runs = result.scalars().all()
+    run_counts = await db.run_sync(count_runs_by_status, workflow_id=workflow_id)
+    await db.close()
+
+    workflow.is_paused_in_airflow = is_paused
+    return WorkflowOverviewResponse(
+        **WorkflowResponse.model_validate(workflow).model_dump(),
+        tasks=workflow.tasks,
+        recent_runs=recent_runs,
+        run_counts=run_counts
+    )
+
+
 @router.put("/{workflow_id}", response_model=WorkflowResponse)
 def update_workflow(
     workflow_id: UUID,
@@ -136,30 +247,38 @@ def delete_workflow(
             detail=f"Workflow {workflow_id} not found"
         )
 
-    # Remove DAG file if exists
-    dag_gen.remove_dag(str(workflow_id))
+    # Remove DAG file (or factory snapshot entry) if exists
+    with deploy_manager.write_lock:
+        dag_gen.remove_dag(str(workflow_id))
 
     # Delete workflow (tasks will be cascade deleted)
     db.delete(workflow)
     db.commit()
 
 
-@router.post("/{workflow_id}/deploy", response_model=dict)
-def deploy_workflow(
+@router.post("/{workflow_id}/deploy", response_model=DeployResponse, status_code=status.HTTP_202_ACCEPTED)
+async def deploy_workflow(
     workflow_id: UUID,
-    db: Session = Depends(get_db),
-    dag_gen: DAGGenerator = Depends(get_dag_generator)
+    db: AsyncSession = Depends(get_async_db),
+    dag_gen: DAGGenerator = Depends(get_dag_generator),
+    airflow: AirflowClient = Depends(get_airflow_client)
 ):
-    """Deploy workflow to Airflow by generating DAG file"""
+    """
+    Deploy workflow to Airflow by generating DAG file
+
+    Returns immediately with a deploy ID; the DAG file is rendered, written,
+    parsed by Airflow and unpaused in the background. Poll
+    GET /workflows/deploys/{deploy_id} for progress.
+    """
     # Get workflow and tasks
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    workflow = await db.get(Workflow, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Workflow {workflow_id} not found"
         )
 
-    tasks = db.query(Task).filter(Task.workflow_id == workflow_id).all()
+    tasks = (await db.execute(select(Task).where(Task.workflow_id == workflow_id))).scalars().all()
     if not tasks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -176,41 +295,71 @@ def deploy_workflow(
                     detail=f"Task '{task.name}' has invalid dependency '{dep}'"
                 )
 
-    # Generate and deploy DAG
-    try:
-        dag_file_path = dag_gen.deploy_dag(workflow, tasks)
-        return {
-            "message": "Workflow deployed successfully",
-            "dag_id": f"workflow_{workflow_id}",
-            "dag_file": str(dag_file_path),
-            "note": "DAG will be picked up by Airflow scheduler within 30 seconds"
-        }
-    except Exception as e:
+    # Detach the loaded rows; the deploy job renders from them after this request ends
+    await db.close()
+
+    job = deploy_manager.submit(dag_gen, airflow, workflow, list(tasks))
+    return job.to_dict()
+
+
+@router.get("/deploys/{deploy_id}", response_model=DeployResponse)
+async def get_deploy(deploy_id: str):
+    """Get the status of a deploy started by POST /workflows/{workflow_id}/deploy"""
+    job = deploy_manager.get(deploy_id)
+    if job is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to deploy workflow: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Deploy {deploy_id} not found"
         )
+    return job.to_dict()
+
+
+@router.get("/dags/verify", response_model=DagVerifyResponse)
+async def verify_dag_files(
+    db: AsyncSession = Depends(get_async_db),
+    dag_gen: DAGGenerator = Depends(get_dag_generator)
+):
+    """
+    Compare every workflow's recorded DAG hash with its file in the dags folder
+
+    Reports missing, hand-modified and out-of-date DAG files, plus DAG files
+    left behind by deleted workflows.
+    """
+    rows = (await db.execute(select(Workflow.id, Workflow.dag_hash))).all()
+    await db.close()
+
+    recorded_hashes = {str(row.id): row.dag_hash for row in rows}
+    return await asyncio.to_thread(dag_gen.verify_dag_files, recorded_hashes)
 
 
 @router.post("/{workflow_id}/pause")
 async def pause_workflow(
     workflow_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Pause workflow in Airflow"""
     # Get workflow
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    workflow = await db.get(Workflow, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Workflow {workflow_id} not found"
         )
 
+    # Release the connection before calling Airflow
+    await db.close()
+
     dag_id = f"workflow_{workflow_id}"
     try:
         await airflow.pause_dag(dag_id, is_paused=True)
+        change_feed.publish("workflow.paused", {"workflow_id": str(workflow_id), "dag_id": dag_id})
         return {"message": "Workflow paused successfully", "dag_id": dag_id}
+    except AirflowUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to pause workflow: Airflow is unavailable ({str(e)})"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -221,22 +370,31 @@ async def pause_workflow(
 @router.post("/{workflow_id}/unpause")
 async def unpause_workflow(
     workflow_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Unpause workflow in Airflow"""
     # Get workflow
-    workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+    workflow = await db.get(Workflow, workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Workflow {workflow_id} not found"
         )
 
+    # Release the connection before calling Airflow
+    await db.close()
+
     dag_id = f"workflow_{workflow_id}"
     try:
         await airflow.unpause_dag(dag_id)
+        change_feed.publish("workflow.unpaused", {"workflow_id": str(workflow_id), "dag_id": dag_id})
         return {"message": "Workflow unpaused successfully", "dag_id": dag_id}
+    except AirflowUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to unpause workflow: Airflow is unavailable ({str(e)})"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -246,12 +404,15 @@ async def unpause_workflow(
 
 @router.post("/unpause-all-active")
 async def unpause_all_active_workflows(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """Unpause all active workflows in Airflow"""
     # Get all active workflows
-    workflows = db.query(Workflow).filter(Workflow.is_active == True).all()
+    workflows = (await db.execute(select(Workflow).where(Workflow.is_active == True))).scalars().all()
+
+    # Detach the workflows and release the connection before calling Airflow
+    await db.close()
     
     success_count = 0
     failed_count = 0
@@ -264,6 +425,7 @@ async def unpause_all_active_workflows(
             dag_info = await airflow.get_dag(dag_id)
             if dag_info.get("is_paused", False):
                 await airflow.unpause_dag(dag_id)
+                change_feed.publish("workflow.unpaused", {"workflow_id": str(workflow.id), "dag_id": dag_id})
                 success_count += 1
                 results.append({"workflow_id": str(workflow.id), "name": workflow.name, "status": "unpaused"})
             else:
@@ -284,9 +446,18 @@ async def unpause_all_active_workflows(
 @router.get("/{workflow_id}/tasks")
 def get_workflow_tasks(
     workflow_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """Get all tasks for a workflow"""
+    versions = get_table_versions(db, ["workflows", "tasks"])
+    if versions is not None:
+        etag = make_etag(versions, workflow_id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers.update(etag_headers(etag))
+
     workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
     if not workflow:
         raise HTTPException(
@@ -304,8 +475,9 @@ def get_workflow_tasks(
 @router.post("/import-yaml", response_model=WorkflowResponse, status_code=status.HTTP_201_CREATED)
 async def import_workflow_from_yaml(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    dag_gen: DAGGenerator = Depends(get_dag_generator)
+    db: AsyncSession = Depends(get_async_db),
+    dag_gen: DAGGenerator = Depends(get_dag_generator),
+    airflow: AirflowClient = Depends(get_airflow_client)
 ):
     """
     Import workflow from YAML file
@@ -326,14 +498,17 @@ async def import_workflow_from_yaml(
 
     # Import workflow
     try:
-        result = YAMLWorkflowService.import_from_yaml(yaml_str, db)
+        result = await db.run_sync(lambda sync_db: YAMLWorkflowService.import_from_yaml(yaml_str, sync_db))
         workflow = result["workflow"]
         tasks = result["tasks"]
         
-        # Auto-deploy the DAG to Airflow
+        # Auto-deploy the DAG to Airflow in the background
         if tasks:
             try:
-                dag_gen.deploy_dag(workflow, tasks)
+                # Load every task column in one query, then detach: the job renders after the session closes
+                tasks = (await db.execute(select(Task).where(Task.workflow_id == workflow.id))).scalars().all()
+                await db.close()
+                deploy_manager.submit(dag_gen, airflow, workflow, list(tasks))
             except Exception as e:
                 # Log the error but don't fail the import
                 print(f"Warning: Failed to auto-deploy DAG for workflow {workflow.id}: {str(e)}")
@@ -345,7 +520,7 @@ async def import_workflow_from_yaml(
             detail=str(e)
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to import workflow: {str(e)}"
@@ -355,6 +530,7 @@ async def import_workflow_from_yaml(
 @router.get("/{workflow_id}/export-yaml")
 def export_workflow_to_yaml(
     workflow_id: UUID,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -362,6 +538,14 @@ def export_workflow_to_yaml(
 
     Download the workflow and its tasks as a YAML file.
     """
+    versions = get_table_versions(db, ["workflows", "tasks"])
+    headers = {}
+    if versions is not None:
+        etag = make_etag(versions, workflow_id, "yaml")
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        headers = etag_headers(etag)
+
     # Get workflow
     workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
     if not workflow:
@@ -382,7 +566,8 @@ def export_workflow_to_yaml(
             content=yaml_content,
             media_type="application/x-yaml",
             headers={
-                "Content-Disposition": f"attachment; filename={workflow.name}.yaml"
+                "Content-Disposition": f"attachment; filename={workflow.name}.yaml",
+                **headers
             }
         )
     except Exception as e:
@@ -1,18 +1,78 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.db_telemetry import InstrumentedAsyncQueuePool, InstrumentedQueuePool, install_slow_query_log
+
+# Pool settings shared by both engines (each engine has its own pool of this size)
+POOL_OPTIONS: Dict[str, Any] = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # Verify connections before using
+    echo=settings.DB_ECHO,  # Log every SQL statement (slow queries are logged regardless)
+)
+
+
+def _connect_args(driver: str) -> Dict[str, Any]:
+    """Driver connect arguments for statement_timeout and PgBouncer mode"""
+    args: Dict[str, Any] = {}
+    if settings.DB_PGBOUNCER:
+        if driver == "asyncpg":
+            # Transaction pooling can't keep server-side prepared statements
+            args["statement_cache_size"] = 0
+            args["prepared_statement_cache_size"] = 0
+        # PgBouncer rejects startup parameters; statement_timeout is set per transaction instead
+        return args
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        if driver == "asyncpg":
+            args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}
+        else:
+            args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+    return args
+
+
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT > 0:
+    # Behind PgBouncer, set statement_timeout per transaction (covers sync and async sessions)
+    @event.listens_for(Session, "after_begin")
+    def _set_statement_timeout(session, transaction, connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT}")
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    poolclass=InstrumentedQueuePool,
+    connect_args=_connect_args("psycopg2"),
+    **POOL_OPTIONS,
 )
+install_slow_query_log(engine, settings.DB_SLOW_QUERY_MS)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for async endpoints (asyncpg); same database, separate pool
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_connect_args("asyncpg"),
+    **POOL_OPTIONS,
+)
+install_slow_query_log(async_engine.sync_engine, settings.DB_SLOW_QUERY_MS)
+
+# Objects stay readable after commit, so endpoints can return them without a reload
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create Base class for models
 Base = declarative_base()
 
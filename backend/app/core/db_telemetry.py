@@ -0,0 +1,122 @@
+"""
+Connection pool telemetry and slow-query logging
+Instrumented pool classes record how long checkouts wait, and engine event
+hooks log only statements slower than a threshold (instead of echoing all SQL)
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolWaitStats:
+    """Checkout wait-time counters shared by one pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+
+class _WaitTimingMixin:
+    """Time every pool checkout, including the wait for a free connection"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self) -> Pool:
+        # Keep counters across pool recreation (e.g. after engine.dispose())
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool with checkout wait-time stats"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait-time stats"""
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Get live pool counters for an engine
+
+    Returns:
+        Dict with pool size, checked-out connections, overflow and wait times
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # Negative while the pool hasn't opened all of its pool_size connections
+            "overflow": pool.overflow(),
+        })
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update({
+            "checkouts": wait_stats.checkouts,
+            "checkout_timeouts": wait_stats.timeouts,
+            "avg_wait_ms": round(wait_stats.total_wait / wait_stats.checkouts * 1000, 3) if wait_stats.checkouts else 0,
+            "max_wait_ms": round(wait_stats.max_wait * 1000, 3),
+        })
+    return stats
+
+
+def install_slow_query_log(engine: Engine, threshold_ms: float) -> None:
+    """
+    Log statements that take longer than threshold_ms
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        threshold_ms: Minimum duration to log; 0 or less disables the log
+    """
+    if threshold_ms <= 0:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        if elapsed_ms >= threshold_ms:
+            print(f"Slow query ({elapsed_ms:.1f} ms): {' '.join(statement.split())[:1000]}")
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
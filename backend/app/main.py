@@ -1,6 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.database import async_engine
+from app.services.airflow_client import init_airflow_client, close_airflow_client
+from app.services.airflow_metadata import close_airflow_metadata
+from app.services.change_feed import change_feed
+from app.services.deploys import deploy_manager
+from app.services.etag import start_change_version_compactor, stop_change_version_compactor
+from app.services.resilience import AirflowDeadlineMiddleware
+from app.services.partition_maintenance import start_partition_maintainer, stop_partition_maintainer
+from app.services.run_reconciler import start_run_reconciler, stop_run_reconciler
+from app.services.run_waiters import run_waiters
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open long-lived resources on startup and release them on shutdown"""
+    airflow = init_airflow_client()
+    change_feed.bind(asyncio.get_running_loop())
+    run_waiters.bind(asyncio.get_running_loop())
+    if settings.RUN_RECONCILER_ENABLED:
+        start_run_reconciler(airflow)
+    if settings.JOB_RUNS_PARTITION_MAINTENANCE_ENABLED:
+        start_partition_maintainer()
+    start_change_version_compactor()
+    yield
+    await deploy_manager.stop()
+    await stop_partition_maintainer()
+    await stop_change_version_compactor()
+    await stop_run_reconciler()
+    await close_airflow_client()
+    close_airflow_metadata()
+    await async_engine.dispose()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -9,6 +43,7 @@ app = FastAPI(
     description="MLOps Workflow Management System - Anyscale Jobs inspired",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -20,6 +55,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Share one Airflow time budget between all outbound calls of a request
+app.add_middleware(AirflowDeadlineMiddleware, budget=settings.AIRFLOW_REQUEST_BUDGET)
+
 
 @app.get("/")
 async def root():
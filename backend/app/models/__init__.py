@@ -1,5 +1,6 @@
 from app.models.workflow import Workflow
 from app.models.task import Task
 from app.models.job_run import JobRun
+from app.models.task_run import TaskRun
 
-__all__ = ["Workflow", "Task", "JobRun"]
+__all__ = ["Workflow", "Task", "JobRun", "TaskRun"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, String, DateTime, ForeignKey, Index, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -6,24 +6,59 @@ import uuid
 
 from app.core.database import Base
 
+# Job run statuses that can still change
+NON_TERMINAL_STATES = ("queued", "running")
+
 
 class JobRun(Base):
     """JobRun model - represents an execution of a workflow"""
 
     __tablename__ = "job_runs"
+    # Monthly partitions (job_runs_pYYYYMM) are created and retired by
+    # app.services.partition_maintenance
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workflow_id = Column(UUID(as_uuid=True), ForeignKey("workflows.id"), nullable=False)
-    dag_run_id = Column(String(255), unique=True, index=True)  # Airflow DAG run ID
+    dag_run_id = Column(String(255), index=True)  # Airflow DAG run ID
     status = Column(String(50), default="queued", nullable=False)  # queued, running, success, failed
     triggered_by = Column(String(100), default="manual")
     started_at = Column(DateTime)
     ended_at = Column(DateTime)
     logs = Column(JSONB, default=dict)  # Task-level logs summary
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Partition key, so part of the table's primary key; rows are still identified by id alone
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
+
+    __mapper_args__ = {"primary_key": [id]}
 
-    # Relationships
+    # Relationships (no foreign key from task_runs: it would have to include created_at)
     workflow = relationship("Workflow", back_populates="job_runs")
+    task_runs = relationship(
+        "TaskRun",
+        primaryjoin="JobRun.id == foreign(TaskRun.job_run_id)",
+        back_populates="job_run",
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self):
         return f"<JobRun(id={self.id}, workflow_id={self.workflow_id}, status='{self.status}')>"
+
+
+# Hot-path indexes (list_job_runs filters + newest-first paging, stats window,
+# reconciler scan of pending runs)
+Index("ix_job_runs_workflow_id_created_at", JobRun.workflow_id, JobRun.created_at.desc())
+Index("ix_job_runs_status_created_at", JobRun.status, JobRun.created_at.desc())
+Index("ix_job_runs_created_at", JobRun.created_at.desc())
+Index(
+    "ix_job_runs_pending",
+    JobRun.created_at,
+    postgresql_where=JobRun.status.in_(NON_TERMINAL_STATES),
+)
+
+# Catch-all partition, so a database built with create_all accepts inserts
+# before the maintenance job has created monthly partitions
+event.listen(
+    JobRun.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS job_runs_default PARTITION OF job_runs DEFAULT"),
+)
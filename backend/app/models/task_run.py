@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.core.database import Base
+
+
+class TaskRun(Base):
+    """TaskRun model - state of one task within a job run (latest try)"""
+
+    __tablename__ = "task_runs"
+    __table_args__ = (
+        UniqueConstraint('job_run_id', 'task_id', name='uq_task_runs_job_run_task'),
+        Index('ix_task_runs_state', 'state'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_run_id = Column(UUID(as_uuid=True), nullable=False)  # JobRun.id (deleted when its partition is archived)
+    task_id = Column(String(255), nullable=False)  # Airflow task ID (= Task.name)
+    state = Column(String(50))  # Airflow task instance state (None until scheduled)
+    try_number = Column(Integer, default=0, nullable=False)
+    queued_at = Column(DateTime)
+    started_at = Column(DateTime)
+    ended_at = Column(DateTime)
+    duration = Column(Float)  # Seconds
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Relationships
+    job_run = relationship(
+        "JobRun",
+        primaryjoin="foreign(TaskRun.job_run_id) == JobRun.id",
+        back_populates="task_runs",
+    )
+
+    def __repr__(self):
+        return f"<TaskRun(job_run_id={self.job_run_id}, task_id='{self.task_id}', state='{self.state}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,7 @@ class Workflow(Base):
     description = Column(Text)
     schedule = Column(String(100))  # Cron expression or Airflow preset
     is_active = Column(Boolean, default=True)
+    dag_hash = Column(String(64))  # Content hash of the last published DAG file
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -27,3 +28,7 @@ class Workflow(Base):
 
     def __repr__(self):
         return f"<Workflow(id={self.id}, name='{self.name}')>"
+
+
+# list_workflows newest-first keyset paging on (created_at, id)
+Index("ix_workflows_created_at_id", Workflow.created_at.desc(), Workflow.id.desc())
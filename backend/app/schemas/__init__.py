@@ -3,6 +3,7 @@ from app.schemas.workflow import (
     WorkflowUpdate,
     WorkflowResponse,
     WorkflowListResponse,
+    WorkflowOverviewResponse,
 )
 from app.schemas.task import (
     TaskCreate,
@@ -14,16 +15,35 @@ from app.schemas.job_run import (
     JobRunResponse,
     JobRunListResponse,
 )
+from app.schemas.task_run import (
+    TaskRunResponse,
+    TaskRunListResponse,
+)
+from app.schemas.deploy import DeployResponse, DagFileCheck, DagVerifyResponse
+from app.schemas.run_event import (
+    RunStateEvent,
+    RunStateEventBatch,
+    RunStateEventResult,
+)
 
 __all__ = [
     "WorkflowCreate",
     "WorkflowUpdate",
     "WorkflowResponse",
     "WorkflowListResponse",
+    "WorkflowOverviewResponse",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
     "JobRunCreate",
     "JobRunResponse",
     "JobRunListResponse",
+    "TaskRunResponse",
+    "TaskRunListResponse",
+    "DeployResponse",
+    "DagFileCheck",
+    "DagVerifyResponse",
+    "RunStateEvent",
+    "RunStateEventBatch",
+    "RunStateEventResult",
 ]
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List, Literal
+from datetime import datetime
+from uuid import UUID
+
+
+class DeployResponse(BaseModel):
+    """Status of a background DAG deploy"""
+    id: str = Field(..., description="Deploy ID (poll GET /api/v1/workflows/deploys/{id})")
+    workflow_id: UUID
+    dag_id: str
+    dag_file: str
+    status: Literal["pending", "running", "succeeded", "failed", "cancelled"]
+    phase: Optional[Literal["rendered", "written", "parsed", "unpaused"]] = Field(None, description="Last completed phase")
+    phases: Dict[str, Optional[datetime]] = Field(..., description="Completion time of each phase: rendered, written, parsed, unpaused")
+    error: Optional[str] = None
+    import_error: Optional[str] = Field(None, description="Airflow's stack trace when the DAG file failed to import")
+    content_hash: Optional[str] = Field(None, description="Content hash of the published DAG file")
+    changed: Optional[bool] = Field(None, description="Whether the file was rewritten (false: identical content, left untouched)")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class DagFileCheck(BaseModel):
+    """Recorded DAG hash of one workflow compared with its file"""
+    workflow_id: UUID
+    dag_file: str
+    status: Literal["ok", "not_deployed", "missing", "unhashed", "modified", "mismatch"]
+    recorded_hash: Optional[str] = None
+    file_hash: Optional[str] = Field(None, description="Hash in the file's header")
+
+
+class DagVerifyResponse(BaseModel):
+    """Result of verifying every workflow's DAG file against its recorded hash"""
+    checked: int
+    counts: Dict[str, int] = Field(..., description="Number of workflows per status")
+    workflows: List[DagFileCheck]
+    orphaned_files: List[str] = Field(..., description="DAG files in the dags folder with no workflow")
@@ -43,3 +43,5 @@ class JobRunListResponse(BaseModel):
     job_runs: List[JobRunResponse]
     page: int
     page_size: int
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate (pass exact_total=true for an exact count)")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
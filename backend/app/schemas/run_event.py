@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
+from datetime import datetime
+
+
+class RunStateEvent(BaseModel):
+    """State change of a DAG run or task instance pushed by the Airflow listener"""
+    type: Literal["dag_run", "task_instance"]
+    dag_id: str
+    run_id: str = Field(..., description="Airflow DAG run ID")
+    task_id: Optional[str] = Field(None, description="Task ID (task_instance events only)")
+    state: str
+    try_number: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    queued_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    ts: Optional[datetime] = Field(None, description="When the listener observed the change")
+
+
+class RunStateEventBatch(BaseModel):
+    """Batch of state change events"""
+    events: List[RunStateEvent] = Field(..., max_length=1000)
+
+
+class RunStateEventResult(BaseModel):
+    """Result of ingesting a batch of state change events"""
+    received: int
+    dag_run_events: int
+    task_instance_events: int
+    job_runs_updated: int
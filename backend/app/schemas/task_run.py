@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from uuid import UUID
+
+
+class TaskRunResponse(BaseModel):
+    """Schema for per-task run state"""
+    task_id: str
+    state: Optional[str] = None
+    try_number: int
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    duration: Optional[float] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskRunListResponse(BaseModel):
+    """Schema for the task runs of one job run"""
+    job_run_id: UUID
+    task_runs: List[TaskRunResponse]
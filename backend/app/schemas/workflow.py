@@ -1,8 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, Dict, List
 from datetime import datetime
 from uuid import UUID
 
+from app.schemas.task import TaskResponse
+from app.schemas.job_run import JobRunResponse
+
 
 class WorkflowBase(BaseModel):
     """Base workflow schema"""
@@ -31,6 +34,7 @@ class WorkflowResponse(WorkflowBase):
     created_at: datetime
     updated_at: datetime
     is_paused_in_airflow: Optional[bool] = Field(None, description="Whether the DAG is paused in Airflow")
+    dag_hash: Optional[str] = Field(None, description="Content hash of the last published DAG file")
 
     class Config:
         from_attributes = True
@@ -42,3 +46,12 @@ class WorkflowListResponse(BaseModel):
     workflows: List[WorkflowResponse]
     page: int
     page_size: int
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate (pass exact_total=true for an exact count)")
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
+
+
+class WorkflowOverviewResponse(WorkflowResponse):
+    """Schema for the workflow detail page: workflow, tasks and recent runs in one response"""
+    tasks: List[TaskResponse]
+    recent_runs: List[JobRunResponse] = Field(..., description="Most recent job runs, newest first")
+    run_counts: Dict[str, int] = Field(..., description="Job run count per status (all time)")
@@ -1,6 +1,53 @@
+import asyncio
 import httpx
-from typing import Dict, Any, Optional, List
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from app.core.config import settings
+from app.services.cache import StaleWhileRevalidateCache
+from app.services.singleflight import SingleFlight
+from app.services.resilience import (
+    CircuitBreaker,
+    DeadlineExceeded,
+    backoff_delay,
+    current_deadline,
+    detached_context,
+)
+
+# Cache key prefix for DAG listings (individual DAGs are keyed by dag_id)
+DAG_LIST_KEY_PREFIX = "list:"
+
+# Responses that mean Airflow itself is unhealthy (worth retrying / tripping the breaker)
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PATCH"}
+
+
+def create_http_client(
+    username: str = settings.AIRFLOW_USERNAME,
+    password: str = settings.AIRFLOW_PASSWORD,
+) -> httpx.AsyncClient:
+    """
+    Create a pooled, keep-alive HTTP client for the Airflow API
+
+    Args:
+        username: Airflow API username
+        password: Airflow API password
+
+    Returns:
+        httpx.AsyncClient configured from settings
+    """
+    return httpx.AsyncClient(
+        auth=(username, password),
+        timeout=httpx.Timeout(
+            settings.AIRFLOW_TIMEOUT,
+            connect=settings.AIRFLOW_CONNECT_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.AIRFLOW_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AIRFLOW_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.AIRFLOW_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.AIRFLOW_HTTP2,
+    )
 
 
 class AirflowClient:
@@ -11,10 +58,146 @@ class AirflowClient:
         base_url: str = settings.AIRFLOW_API_URL,
         username: str = settings.AIRFLOW_USERNAME,
         password: str = settings.AIRFLOW_PASSWORD,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         self.base_url = base_url.rstrip('/')
         self.auth = (username, password)
-        self.timeout = 30.0
+        self.timeout = settings.AIRFLOW_TIMEOUT
+        # Reuse one connection pool for every call made through this client
+        self._client = http_client or create_http_client(username, password)
+        # Background refreshes and shared calls outlive the request that started
+        # them, so each gets a full budget of its own
+        own_budget = partial(detached_context, settings.AIRFLOW_REQUEST_BUDGET)
+        # DAG metadata (pause state etc.) changes rarely, so serve it from memory
+        self.dag_cache = StaleWhileRevalidateCache(
+            ttl=settings.AIRFLOW_DAG_CACHE_TTL,
+            stale_ttl=settings.AIRFLOW_DAG_CACHE_STALE_TTL,
+            context_factory=own_budget,
+        )
+        # Concurrent identical GETs share one in-flight request
+        self.singleflight = SingleFlight(context_factory=own_budget)
+        # Fail fast while Airflow is down instead of waiting out every timeout
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.AIRFLOW_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.AIRFLOW_BREAKER_RECOVERY_TIMEOUT,
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self._client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        retry: Optional[bool] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request through the shared connection pool
+
+        Calls go through the circuit breaker, are retried with jittered
+        backoff when Airflow is unreachable or overloaded, and never outlive
+        the current request's deadline budget.
+
+        Args:
+            method: HTTP method
+            url: Absolute request URL
+            timeout: Optional per-call timeout in seconds (overrides the client default)
+            retry: Whether transient failures may be retried (default: idempotent methods only)
+
+        Returns:
+            The HTTP response (status is raised for errors)
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            DeadlineExceeded: If the request's Airflow budget is used up
+        """
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts = 1 + (settings.AIRFLOW_RETRY_ATTEMPTS if retry else 0)
+        deadline = current_deadline()
+
+        for attempt in range(attempts):
+            call_timeout = timeout
+            if deadline is not None:
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Airflow budget exhausted before {method} {url}")
+                call_timeout = min(call_timeout or self.timeout, remaining)
+
+            probe = self.breaker.before_call()
+            try:
+                if call_timeout is not None:
+                    kwargs["timeout"] = call_timeout
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if not await self._wait_before_retry(attempt, attempts):
+                    raise
+                continue
+            except BaseException:
+                # Cancelled, invalid URL...: says nothing about Airflow's health,
+                # but a half-open probe must not stay claimed forever
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                self.breaker.record_failure()
+                if await self._wait_before_retry(attempt, attempts):
+                    continue
+            else:
+                # Any other answer (including 4xx) means Airflow is up
+                self.breaker.record_success()
+
+            response.raise_for_status()
+            return response
+
+    async def _wait_before_retry(self, attempt: int, attempts: int) -> bool:
+        """
+        Sleep before the next attempt if one is allowed
+
+        Returns:
+            True if the caller should retry, False if it should give up
+        """
+        if attempt + 1 >= attempts:
+            return False
+        delay = backoff_delay(
+            attempt,
+            settings.AIRFLOW_RETRY_BACKOFF,
+            settings.AIRFLOW_RETRY_BACKOFF_MAX,
+        )
+        deadline = current_deadline()
+        if deadline is not None and delay >= deadline.remaining():
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+    async def _shared(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Join the shared call for a key, waiting no longer than this request's deadline
+
+        Raises:
+            DeadlineExceeded: If the request's Airflow budget runs out first
+                (the shared call keeps running for the other callers)
+        """
+        deadline = current_deadline()
+        if deadline is None:
+            return await self.singleflight.do(key, fetch)
+        try:
+            return await asyncio.wait_for(self.singleflight.do(key, fetch), deadline.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Airflow budget exhausted waiting for {key}")
+
+    async def _get_json_shared(self, url: str) -> Any:
+        """GET a JSON resource, sharing the call with concurrent identical requests"""
+        async def fetch() -> Any:
+            response = await self._request("GET", url)
+            return response.json()
+
+        return await self._shared(url, fetch)
 
     async def trigger_dag(
         self,
@@ -34,14 +217,8 @@ class AirflowClient:
         url = f"{self.base_url}/dags/{dag_id}/dagRuns"
         payload = {"conf": conf or {}}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                url,
-                json=payload,
-                auth=self.auth
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("POST", url, json=payload)
+        return response.json()
 
     async def get_dag_run(
         self,
@@ -60,10 +237,7 @@ class AirflowClient:
         """
         url = f"{self.base_url}/dags/{dag_id}/dagRuns/{dag_run_id}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json_shared(url)
 
     async def get_task_instance(
         self,
@@ -84,17 +258,15 @@ class AirflowClient:
         """
         url = f"{self.base_url}/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json_shared(url)
 
     async def get_task_logs(
         self,
         dag_id: str,
         dag_run_id: str,
         task_id: str,
-        task_try_number: int = 1
+        task_try_number: int = 1,
+        timeout: Optional[float] = None
     ) -> str:
         """
         Get task logs
@@ -104,17 +276,19 @@ class AirflowClient:
             dag_run_id: The DAG run ID
             task_id: The task ID
             task_try_number: The task try number (default: 1)
+            timeout: Optional per-call timeout in seconds
 
         Returns:
             Task logs as string
         """
         url = f"{self.base_url}/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}/logs/{task_try_number}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, auth=self.auth)
-            response.raise_for_status()
+        async def fetch() -> str:
+            response = await self._request("GET", url, timeout=timeout)
             return response.text
 
+        return await self._shared(url, fetch)
+
     async def list_dag_runs(
         self,
         dag_id: str,
@@ -139,15 +313,113 @@ class AirflowClient:
             "order_by": "-execution_date"
         }
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params, auth=self.auth)
-            response.raise_for_status()
+        response = await self._request("GET", url, params=params)
+        data = response.json()
+        return data.get("dag_runs", [])
+
+    async def list_dag_runs_batch(
+        self,
+        dag_ids: List[str],
+        states: Optional[List[str]] = None,
+        execution_date_gte: Optional[str] = None,
+        page_limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        List DAG runs across multiple DAGs using the batch endpoint
+
+        Pages through POST /dags/~/dagRuns/list until all matching runs
+        have been fetched.
+
+        Args:
+            dag_ids: DAG IDs to include
+            states: Optional list of DAG run states to filter by
+            execution_date_gte: Optional ISO timestamp lower bound for the logical date
+            page_limit: Page size per request (capped by Airflow's maximum_page_limit)
+
+        Returns:
+            List of DAG runs
+        """
+        if not dag_ids:
+            return []
+
+        url = f"{self.base_url}/dags/~/dagRuns/list"
+        payload: Dict[str, Any] = {
+            "dag_ids": list(dag_ids),
+            "page_limit": page_limit,
+        }
+        if states:
+            payload["states"] = list(states)
+        if execution_date_gte:
+            payload["execution_date_gte"] = execution_date_gte
+
+        dag_runs: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            payload["page_offset"] = offset
+            # Read-only query, so safe to retry despite being a POST
+            response = await self._request("POST", url, retry=True, json=payload)
+            data = response.json()
+            page = data.get("dag_runs", [])
+            dag_runs.extend(page)
+            offset += len(page)
+            if not page or offset >= data.get("total_entries", 0):
+                break
+
+        return dag_runs
+
+    async def list_task_instances_batch(
+        self,
+        dag_ids: List[str],
+        dag_run_ids: Optional[List[str]] = None,
+        states: Optional[List[str]] = None,
+        page_limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        List task instances across multiple DAG runs using the batch endpoint
+
+        Pages through POST /dags/~/dagRuns/~/taskInstances/list until all
+        matching task instances have been fetched.
+
+        Args:
+            dag_ids: DAG IDs to include
+            dag_run_ids: Optional DAG run IDs to include
+            states: Optional list of task instance states to filter by
+            page_limit: Page size per request (capped by Airflow's maximum_page_limit)
+
+        Returns:
+            List of task instances
+        """
+        if not dag_ids:
+            return []
+
+        url = f"{self.base_url}/dags/~/dagRuns/~/taskInstances/list"
+        payload: Dict[str, Any] = {
+            "dag_ids": list(dag_ids),
+            "page_limit": page_limit,
+        }
+        if dag_run_ids:
+            payload["dag_run_ids"] = list(dag_run_ids)
+        if states:
+            payload["state"] = list(states)
+
+        task_instances: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            payload["page_offset"] = offset
+            # Read-only query, so safe to retry despite being a POST
+            response = await self._request("POST", url, retry=True, json=payload)
             data = response.json()
-            return data.get("dag_runs", [])
+            page = data.get("task_instances", [])
+            task_instances.extend(page)
+            offset += len(page)
+            if not page or offset >= data.get("total_entries", 0):
+                break
+
+        return task_instances
 
     async def get_dag(self, dag_id: str) -> Dict[str, Any]:
         """
-        Get DAG details
+        Get DAG details (served from the DAG metadata cache when fresh)
 
         Args:
             dag_id: The DAG ID
@@ -155,12 +427,105 @@ class AirflowClient:
         Returns:
             DAG information
         """
+        return await self.dag_cache.get(dag_id, lambda: self._fetch_dag(dag_id))
+
+    async def _fetch_dag(self, dag_id: str) -> Dict[str, Any]:
+        """Fetch DAG details from Airflow, bypassing the cache"""
         url = f"{self.base_url}/dags/{dag_id}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json_shared(url)
+
+    async def refresh_dag(self, dag_id: str) -> Dict[str, Any]:
+        """
+        Fetch DAG details from Airflow and replace the cached entry
+
+        Args:
+            dag_id: The DAG ID
+
+        Returns:
+            DAG information (raises httpx.HTTPStatusError 404 until the DAG is parsed)
+        """
+        dag_info = await self._fetch_dag(dag_id)
+        self.dag_cache.set(dag_id, dag_info)
+        return dag_info
+
+    async def list_import_errors(self, page_limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        List DAG file import errors, paging through GET /importErrors
+
+        Args:
+            page_limit: Page size per request (capped by Airflow's maximum_page_limit)
+
+        Returns:
+            Import errors (filename, stack_trace, timestamp)
+        """
+        url = f"{self.base_url}/importErrors"
+        params: Dict[str, Any] = {"limit": page_limit}
+
+        import_errors: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            params["offset"] = offset
+            response = await self._request("GET", url, params=params)
+            data = response.json()
+            page = data.get("import_errors", [])
+            import_errors.extend(page)
+            offset += len(page)
+            if not page or offset >= data.get("total_entries", 0):
+                break
+
+        return import_errors
+
+    async def list_dags(
+        self,
+        dag_id_pattern: str = "workflow_",
+        page_limit: int = 100
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        List DAGs matching a pattern, paging through GET /dags
+        (served from the DAG metadata cache when fresh)
+
+        Args:
+            dag_id_pattern: Substring the DAG IDs must contain
+            page_limit: Page size per request (capped by Airflow's maximum_page_limit)
+
+        Returns:
+            Dict of DAG information keyed by dag_id
+        """
+        return await self.dag_cache.get(
+            f"{DAG_LIST_KEY_PREFIX}{dag_id_pattern}",
+            lambda: self._fetch_dags(dag_id_pattern, page_limit)
+        )
+
+    async def _fetch_dags(
+        self,
+        dag_id_pattern: str,
+        page_limit: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch all DAGs matching a pattern from Airflow, bypassing the cache"""
+        url = f"{self.base_url}/dags"
+        params: Dict[str, Any] = {
+            "dag_id_pattern": dag_id_pattern,
+            "limit": page_limit,
+        }
+
+        dags: Dict[str, Dict[str, Any]] = {}
+        # A DAG paused or unpaused while the list loads keeps its newer entry
+        started = self.dag_cache.version()
+        offset = 0
+        while True:
+            params["offset"] = offset
+            response = await self._request("GET", url, params=params)
+            data = response.json()
+            page = data.get("dags", [])
+            for dag in page:
+                dags[dag["dag_id"]] = dag
+                self.dag_cache.set(dag["dag_id"], dag, since=started)
+            offset += len(page)
+            if not page or offset >= data.get("total_entries", 0):
+                break
+
+        return dags
 
     async def pause_dag(self, dag_id: str, is_paused: bool = True) -> Dict[str, Any]:
         """
@@ -176,10 +541,13 @@ class AirflowClient:
         url = f"{self.base_url}/dags/{dag_id}"
         payload = {"is_paused": is_paused}
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.patch(url, json=payload, auth=self.auth)
-            response.raise_for_status()
-            return response.json()
+        response = await self._request("PATCH", url, json=payload)
+        dag_info = response.json()
+
+        # Our own change supersedes anything cached for this DAG
+        self.dag_cache.set(dag_id, dag_info)
+        self.dag_cache.invalidate_prefix(DAG_LIST_KEY_PREFIX)
+        return dag_info
 
     async def unpause_dag(self, dag_id: str) -> Dict[str, Any]:
         """
@@ -202,8 +570,32 @@ class AirflowClient:
         """
         try:
             url = f"{self.base_url.replace('/api/v1', '')}/health"
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url)
-                return response.status_code == 200
+            response = await self._client.get(url, timeout=5.0)
+            return response.status_code == 200
         except Exception:
             return False
+
+
+# Process-wide client, opened and closed by the application lifespan
+_shared_client: Optional[AirflowClient] = None
+
+
+def init_airflow_client() -> AirflowClient:
+    """
+    Create the process-wide Airflow client if it does not exist yet
+
+    Returns:
+        The shared AirflowClient
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AirflowClient()
+    return _shared_client
+
+
+async def close_airflow_client() -> None:
+    """Close the process-wide Airflow client and its connection pool"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -0,0 +1,158 @@
+"""
+Read-only access to Airflow's metadata tables (dag_run, task_instance)
+Used instead of the REST API for run and task state when
+AIRFLOW_STATE_SOURCE is "database": a page of runs is one indexed query
+instead of HTTP round trips through the webserver
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import column, create_engine, select, table, tuple_
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+dag_run_table = table(
+    "dag_run",
+    column("dag_id"),
+    column("run_id"),
+    column("state"),
+    column("start_date"),
+    column("end_date"),
+)
+
+task_instance_table = table(
+    "task_instance",
+    column("dag_id"),
+    column("run_id"),
+    column("task_id"),
+    column("map_index"),
+    column("state"),
+    column("try_number"),
+    column("queued_dttm"),
+    column("start_date"),
+    column("end_date"),
+    column("duration"),
+)
+
+
+def _iso(value: Any) -> Optional[str]:
+    """Timestamps as ISO strings, like the REST API returns them"""
+    return value.isoformat() if value is not None else None
+
+
+class AirflowMetadataRepository:
+    """Queries Airflow's dag_run and task_instance tables over a read-only connection"""
+
+    def __init__(self, database_url: str):
+        """
+        Initialize the repository
+
+        Args:
+            database_url: SQLAlchemy URL of Airflow's metadata database
+        """
+        self.engine: Engine = create_engine(
+            database_url,
+            pool_size=2,
+            max_overflow=2,
+            pool_pre_ping=True,
+            # Never write to Airflow's tables, whatever the query
+            connect_args={"options": "-c default_transaction_read_only=on"},
+        )
+
+    def get_dag_runs(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Get DAG runs by (dag_id, run_id) with one query
+
+        Args:
+            keys: (dag_id, dag_run_id) pairs
+
+        Returns:
+            DAG runs in the REST API's shape, keyed by (dag_id, dag_run_id)
+        """
+        keys = sorted(set(keys))
+        if not keys:
+            return {}
+
+        d = dag_run_table.c
+        stmt = select(d.dag_id, d.run_id, d.state, d.start_date, d.end_date).where(
+            tuple_(d.dag_id, d.run_id).in_(keys)
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        return {
+            (row.dag_id, row.run_id): {
+                "dag_id": row.dag_id,
+                "dag_run_id": row.run_id,
+                "state": row.state,
+                "start_date": _iso(row.start_date),
+                "end_date": _iso(row.end_date),
+            }
+            for row in rows
+        }
+
+    def get_task_instances(self, keys: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Get the task instances of a set of DAG runs with one query
+
+        Args:
+            keys: (dag_id, dag_run_id) pairs
+
+        Returns:
+            Task instances in the REST API's shape
+        """
+        keys = sorted(set(keys))
+        if not keys:
+            return []
+
+        t = task_instance_table.c
+        stmt = select(
+            t.dag_id, t.run_id, t.task_id, t.map_index, t.state, t.try_number,
+            t.queued_dttm, t.start_date, t.end_date, t.duration,
+        ).where(tuple_(t.dag_id, t.run_id).in_(keys))
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        return [
+            {
+                "dag_id": row.dag_id,
+                "dag_run_id": row.run_id,
+                "task_id": row.task_id,
+                "map_index": row.map_index,
+                "state": row.state,
+                "try_number": row.try_number,
+                "queued_when": _iso(row.queued_dttm),
+                "start_date": _iso(row.start_date),
+                "end_date": _iso(row.end_date),
+                "duration": row.duration,
+            }
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.engine.dispose()
+
+
+# Process-wide repository, created on first use when enabled
+_repository: Optional[AirflowMetadataRepository] = None
+
+
+def get_airflow_metadata() -> Optional[AirflowMetadataRepository]:
+    """
+    Get the metadata repository, or None when state is read through the REST API
+    """
+    global _repository
+    if settings.AIRFLOW_STATE_SOURCE != "database":
+        return None
+    if _repository is None:
+        _repository = AirflowMetadataRepository(
+            settings.AIRFLOW_METADATA_DATABASE_URL or settings.DATABASE_URL
+        )
+    return _repository
+
+
+def close_airflow_metadata() -> None:
+    """Close the process-wide repository"""
+    global _repository
+    if _repository is not None:
+        _repository.close()
+        _repository = None
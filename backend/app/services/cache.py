@@ -0,0 +1,185 @@
+"""
+In-process TTL cache with stale-while-revalidate semantics
+Used by the Airflow client to serve DAG metadata without a round trip
+"""
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+
+class StaleWhileRevalidateCache:
+    """
+    TTL cache that serves stale entries while refreshing them in the background
+
+    - Entries younger than ``ttl`` are returned directly (hit).
+    - Entries younger than ``ttl + stale_ttl`` are returned immediately and
+      refreshed in a background task (stale hit).
+    - Older or missing entries are fetched inline (miss). If that fetch fails
+      and any previous value exists, the previous value is returned instead
+      of raising.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float,
+        context_factory: Callable[[], contextvars.Context] = contextvars.Context
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an entry is considered fresh
+            stale_ttl: Extra seconds a stale entry may be served while revalidating
+            context_factory: Builds the context background refreshes run in
+                (default: empty, so they don't inherit the triggering request's state)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.context_factory = context_factory
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        # Write clock, stamped on keys and prefixes when they are set or
+        # invalidated, so fetches started earlier don't overwrite newer data
+        self._clock = 0
+        self._generations: Dict[str, int] = {}
+        self._prefix_generations: Dict[str, int] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stale_on_error = 0
+        self.refresh_errors = 0
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a value, fetching or revalidating it as needed
+
+        Args:
+            key: Cache key
+            fetch: Coroutine factory that loads the current value
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            age = now - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._schedule_refresh(key, fetch)
+                return entry[1]
+
+        self.misses += 1
+        started = self._clock
+        try:
+            value = await fetch()
+        except Exception:
+            if entry is not None:
+                self.stale_on_error += 1
+                return entry[1]
+            raise
+
+        if self._generation(key) <= started:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def version(self) -> int:
+        """Current write clock, to pass as ``since`` to set for data fetched after this point"""
+        return self._clock
+
+    def set(self, key: str, value: Any, since: Optional[int] = None) -> None:
+        """
+        Store a known-fresh value, superseding any in-flight refresh
+
+        Args:
+            key: Cache key
+            value: Value to store
+            since: version() from before the value was fetched; the value is
+                dropped if the key was set or invalidated after that
+        """
+        if since is not None and self._generation(key) > since:
+            return
+        self._generations[key] = self._tick()
+        self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry immediately"""
+        self._generations[key] = self._tick()
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every entry whose key starts with the given prefix, and discard
+        the results of fetches for such keys that are already in flight"""
+        self._prefix_generations[prefix] = self._tick()
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._entries.pop(key, None)
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _generation(self, key: str) -> int:
+        """Clock of the last write or invalidation covering a key"""
+        generation = self._generations.get(key, 0)
+        for prefix, prefix_generation in self._prefix_generations.items():
+            if key.startswith(prefix):
+                generation = max(generation, prefix_generation)
+        return generation
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self.invalidate_prefix("")
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Start a background refresh for a key unless one is already running"""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        # The refresh outlives the request that noticed the stale entry
+        task = asyncio.create_task(
+            self._refresh(key, fetch, self._clock),
+            context=self.context_factory()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        started: int
+    ) -> None:
+        """Reload a stale entry, keeping the old value if the fetch fails"""
+        try:
+            value = await fetch()
+            if self._generation(key) <= started:
+                self._entries[key] = (time.monotonic(), value)
+        except Exception:
+            self.refresh_errors += 1
+        finally:
+            self._refreshing.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict with hit/miss counters and current size
+        """
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "stale_on_error": self.stale_on_error,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups * 100, 2) if lookups else 0,
+        }
@@ -0,0 +1,167 @@
+"""
+In-process change feed for job run and workflow state changes
+Backs the Server-Sent Events stream: one shared buffer for every open connection
+"""
+import asyncio
+import itertools
+import threading
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class ChangeEvent:
+    """One delta in the feed"""
+
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, event_id: str, event_type: str, data: Dict[str, Any]):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+
+class ChangeFeed:
+    """
+    Broadcast buffer of recent change events
+
+    Event IDs are "<epoch>-<sequence>", where the epoch identifies this
+    process. A subscriber resuming with a Last-Event-ID from another epoch,
+    or one that has already fallen out of the buffer, gets a "reset" event
+    and should refetch its data.
+
+    publish() may be called from worker threads (sync endpoints, reconciler
+    DB work); subscribers are woken on the event loop.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer: Deque[Tuple[int, ChangeEvent]] = deque(maxlen=buffer_size)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed = asyncio.Event()
+        self.published = 0
+        self.subscribers = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the event loop subscribers run on (called from the app lifespan)"""
+        self._loop = loop
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> ChangeEvent:
+        """
+        Append an event and wake all subscribers
+
+        Args:
+            event_type: e.g. "run.created", "run.status_changed", "workflow.paused"
+            data: JSON-serializable payload
+
+        Returns:
+            The published event
+        """
+        with self._lock:
+            seq = next(self._seq)
+            event = ChangeEvent(f"{self.epoch}-{seq}", event_type, data)
+            self._buffer.append((seq, event))
+            self._last_seq = seq
+            self.published += 1
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return event
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._notify()
+        else:
+            loop.call_soon_threadsafe(self._notify)
+        return event
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Sequence number for a Last-Event-ID from this epoch, else None"""
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def _since(self, seq: int) -> Optional[List[Tuple[int, ChangeEvent]]]:
+        """Events after seq, or None if some of them were already dropped"""
+        with self._lock:
+            if self._buffer and self._buffer[0][0] > seq + 1:
+                return None
+            return [(s, e) for s, e in self._buffer if s > seq]
+
+    async def subscribe(
+        self,
+        last_event_id: Optional[str] = None,
+        heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[ChangeEvent]]:
+        """
+        Iterate over events as they are published
+
+        Yields None every ``heartbeat`` seconds without events so the caller
+        can keep the connection alive and check for disconnects.
+
+        Args:
+            last_event_id: Resume after this event ID (Last-Event-ID header)
+            heartbeat: Seconds between keep-alive yields
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        self.subscribers += 1
+        try:
+            seq = self._parse_event_id(last_event_id)
+            if last_event_id and seq is None:
+                yield ChangeEvent(f"{self.epoch}-{self._last_seq}", "reset", {})
+            if seq is None:
+                seq = self._last_seq
+
+            while True:
+                waiter = self._changed
+                events = self._since(seq)
+                if events is None:
+                    seq = self._last_seq
+                    yield ChangeEvent(f"{self.epoch}-{seq}", "reset", {})
+                    continue
+                for event_seq, event in events:
+                    seq = event_seq
+                    yield event
+                if events:
+                    continue
+
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.subscribers -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get feed counters
+
+        Returns:
+            Dict with subscriber and event counts
+        """
+        return {
+            "epoch": self.epoch,
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "buffered": len(self._buffer),
+            "last_event_id": f"{self.epoch}-{self._last_seq}",
+        }
+
+
+# Process-wide feed shared by every stream connection
+change_feed = ChangeFeed(buffer_size=settings.CHANGE_FEED_BUFFER_SIZE)
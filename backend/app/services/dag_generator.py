@@ -1,48 +1,178 @@
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 from pathlib import Path
-from typing import List
-import httpx
-import time
-from app.models.workflow import Workflow
-from app.models.task import Task
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional
+import hashlib
+import importlib.util
+import json
+import os
+import pprint
+import re
+
+if TYPE_CHECKING:
+    # Only attributes are read, so the generator also loads without the database layer
+    from app.models.workflow import Workflow
+    from app.models.task import Task
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+DAG_TEMPLATE_NAME = "dag_template.py.jinja2"
+
+# Builds a DAG from a workflow spec; both templates include it, and it is
+# loaded from its file (not as a package module) to validate specs here
+DAG_RUNTIME_PATH = TEMPLATES_DIR / "dag_runtime.py"
+_runtime_spec = importlib.util.spec_from_file_location("mlops_dag_runtime", DAG_RUNTIME_PATH)
+dag_runtime = importlib.util.module_from_spec(_runtime_spec)
+_runtime_spec.loader.exec_module(dag_runtime)
+
+# First line of every published DAG file: hash of the rendered code below it
+DAG_HASH_HEADER = "# dag-content-hash: "
+
+DAG_FILE_NAME = re.compile(r"^workflow_(.+)\.py$")
+
+# "files": one generated module per workflow; "factory": one factory module
+# building every DAG from a JSON snapshot of the deployed workflows
+DEPLOY_MODES = ("files", "factory")
+DAG_FACTORY_TEMPLATE_NAME = "dag_factory.py.jinja2"
+DAG_FACTORY_FILE_NAME = "mlops_dag_factory.py"
+DAG_SNAPSHOT_FILE_NAME = "mlops_workflows.json"  # Not *.py: Airflow does not parse it
+
+
+def content_hash(dag_code: str) -> str:
+    """SHA-256 hex digest of rendered DAG code"""
+    return hashlib.sha256(dag_code.encode("utf-8")).hexdigest()
+
+
+def _canonical_json(data: Any) -> str:
+    """Compact JSON with sorted keys, so equal data always hashes equally"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _read_file(path: Path) -> Optional[str]:
+    """Read a file exactly as stored (no newline translation), or None if absent"""
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_file_atomic(path: Path, content: str) -> bool:
+    """
+    Replace a file's content atomically unless it already holds exactly `content`
+
+    The content is written to a temporary name (not ending in .py, so Airflow
+    ignores it), fsynced and renamed over the old file, so readers never see a
+    half-written file.
+
+    Returns:
+        True if the file was written, False if it was left untouched
+    """
+    if _read_file(path) == content:
+        return False
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # Persist the rename itself
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return True
+
+
+class DagPublishResult(NamedTuple):
+    """Outcome of publishing a DAG file"""
+    path: Path
+    content_hash: str  # Hash of the workflow's DAG code (files) or snapshot entry (factory)
+    changed: bool  # False when the file already held this content (nothing written)
+
+
+def create_template_environment(bytecode_cache_dir: Optional[str] = None) -> Environment:
+    """
+    Create the Jinja environment for DAG templates
+
+    Compiled templates are cached in memory and reloaded only when the
+    template file's mtime changes; the bytecode cache lets a new process
+    skip compilation too.
+
+    Args:
+        bytecode_cache_dir: Directory for compiled template bytecode (default: a temp directory)
+
+    Returns:
+        Jinja Environment
+    """
+    if bytecode_cache_dir:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache_dir else FileSystemBytecodeCache(),
+        auto_reload=True,
+    )
 
 
 class DAGGenerator:
     """Generator for creating Airflow DAG files from Workflow and Task models"""
 
-    def __init__(self, dags_folder: str, airflow_api_url: str = "http://airflow-webserver:8080"):
+    def __init__(
+        self,
+        dags_folder: str,
+        environment: Optional[Environment] = None,
+        mode: str = "files"
+    ):
         """
         Initialize DAG Generator
 
         Args:
             dags_folder: Path to the Airflow dags folder
-            airflow_api_url: Airflow webserver URL for API calls
+            environment: Jinja environment holding the DAG template (default: a new one)
+            mode: "files" (one DAG file per workflow) or "factory" (one factory
+                file and a snapshot of every deployed workflow)
         """
+        if mode not in DEPLOY_MODES:
+            raise ValueError(f"Unknown DAG deploy mode '{mode}' (expected one of {', '.join(DEPLOY_MODES)})")
         self.dags_folder = Path(dags_folder)
         self.dags_folder.mkdir(parents=True, exist_ok=True)
-        self.template = self._load_template()
-        self.airflow_api_url = airflow_api_url
+        self.environment = environment or create_template_environment()
+        self.mode = mode
+
+    @property
+    def template(self) -> Template:
+        """The compiled DAG template (recompiled only after the file or the runtime it includes changes)"""
+        return self.environment.get_template(DAG_TEMPLATE_NAME)
+
+    @property
+    def factory_file_path(self) -> Path:
+        """Path of the DAG factory module in the dags folder"""
+        return self.dags_folder / DAG_FACTORY_FILE_NAME
 
-    def _load_template(self) -> Template:
-        """Load the DAG template from file"""
-        template_path = Path(__file__).parent.parent / "templates" / "dag_template.py.jinja2"
-        template_content = template_path.read_text(encoding='utf-8')
-        return Template(template_content)
+    @property
+    def snapshot_path(self) -> Path:
+        """Path of the workflow snapshot read by the DAG factory"""
+        return self.dags_folder / DAG_SNAPSHOT_FILE_NAME
 
-    def generate_dag_code(self, workflow: Workflow, tasks: List[Task]) -> str:
+    def template_context(self, workflow: "Workflow", tasks: List["Task"]) -> Dict[str, Any]:
         """
-        Generate DAG Python code from workflow and tasks
+        Workflow and task data a DAG is built from (template variables and snapshot entries)
 
         Args:
             workflow: Workflow model instance
             tasks: List of Task model instances
 
         Returns:
-            Python code for the DAG as a string
+            Dict of plain JSON-serializable values
         """
-        # Prepare task data for template
+        # Ordered by task_id so equal workflows render byte-identical files and content hashes
         tasks_data = []
-        for task in tasks:
+        for task in sorted(tasks, key=lambda t: t.name):
             tasks_data.append({
                 "task_id": task.name,
                 "execution_mode": task.execution_mode or "inline",
@@ -59,120 +189,330 @@ class DAGGenerator:
                 "dependencies": task.dependencies or []
             })
 
-        # Render template
-        dag_code = self.template.render(
-            workflow_id=str(workflow.id),
-            workflow_name=workflow.name,
-            workflow_description=workflow.description or "",
-            schedule=workflow.schedule or "@once",
-            tasks=tasks_data
+        return {
+            "workflow_id": str(workflow.id),
+            "workflow_name": workflow.name,
+            "workflow_description": workflow.description or "",
+            "schedule": workflow.schedule or "@once",
+            "tasks": tasks_data,
+        }
+
+    def generate_dag_code(self, workflow: "Workflow", tasks: List["Task"]) -> str:
+        """
+        Generate DAG Python code from workflow and tasks
+
+        Args:
+            workflow: Workflow model instance
+            tasks: List of Task model instances
+
+        Returns:
+            Python code for the DAG as a string
+
+        Raises:
+            ValueError: If the workflow cannot be built into a DAG
+        """
+        context = self.template_context(workflow, tasks)
+        dag_runtime.validate_workflow(context)
+        return self.template.render(
+            **context,
+            workflow_spec=pprint.pformat(context, sort_dicts=False)
         )
 
-        return dag_code
+    def snapshot_entry(self, workflow: "Workflow", tasks: List["Task"]) -> Dict[str, Any]:
+        """
+        Build a workflow's entry in the DAG factory snapshot
+
+        Args:
+            workflow: Workflow model instance
+            tasks: List of Task model instances
 
-    def unpause_dag(self, dag_id: str, max_retries: int = 10, retry_delay: int = 3) -> bool:
+        Returns:
+            Template context plus "hash", the entry's content hash
+
+        Raises:
+            ValueError: If the workflow cannot be built into a DAG (checked here
+                because the factory skips such a workflow without an import error)
         """
-        Unpause DAG in Airflow via API
+        entry = self.template_context(workflow, tasks)
+        dag_runtime.validate_workflow(entry)
+        entry["hash"] = content_hash(_canonical_json(entry))
+        return entry
+
+    def dag_file_path(self, workflow_id: str) -> Path:
+        """
+        Path of a workflow's DAG file in the dags folder
 
         Args:
-            dag_id: DAG ID to unpause
-            max_retries: Maximum number of retry attempts
-            retry_delay: Delay between retries in seconds
+            workflow_id: Workflow UUID as string
 
         Returns:
-            True if successfully unpaused, False otherwise
-        """
-        url = f"{self.airflow_api_url}/api/v1/dags/{dag_id}"
-
-        # Airflow API credentials (default: admin/admin)
-        auth = ("admin", "admin")
-
-        for attempt in range(max_retries):
-            try:
-                # Wait for Airflow to pick up the new DAG file
-                if attempt > 0:
-                    time.sleep(retry_delay)
-
-                # Update DAG to unpause
-                response = httpx.patch(
-                    url,
-                    json={"is_paused": False},
-                    auth=auth,
-                    timeout=10.0
-                )
-
-                if response.status_code == 200:
-                    return True
-                elif response.status_code == 404:
-                    # DAG not found yet, retry
-                    continue
-                else:
-                    print(f"Failed to unpause DAG {dag_id}: {response.status_code} - {response.text}")
-                    return False
+            Path to the DAG file (which may not exist yet)
+        """
+        return self.dags_folder / f"workflow_{workflow_id}.py"
 
-            except Exception as e:
-                print(f"Error unpausing DAG {dag_id} (attempt {attempt + 1}/{max_retries}): {str(e)}")
-                if attempt == max_retries - 1:
-                    return False
-                continue
+    def deployed_file_path(self, workflow_id: str) -> Path:
+        """
+        File Airflow loads a workflow's DAG from in the current mode
 
-        return False
+        Args:
+            workflow_id: Workflow UUID as string
 
-    def deploy_dag(self, workflow: Workflow, tasks: List[Task]) -> Path:
+        Returns:
+            The factory module in factory mode, the workflow's DAG file otherwise
+        """
+        return self.factory_file_path if self.mode == "factory" else self.dag_file_path(workflow_id)
+
+    def publish_dag(self, workflow_id: str, dag_code: str) -> DagPublishResult:
         """
-        Generate and deploy DAG file to Airflow dags folder
+        Publish generated DAG code to the Airflow dags folder
+
+        The file starts with a hash of the code. If the file on disk already
+        holds this hash and code it is left untouched, so an unchanged redeploy
+        does not make Airflow reparse it. Otherwise the file is written to a
+        temporary name, fsynced and renamed over the old one, so Airflow never
+        reads a half-written file.
+
+        Unpausing and waiting for Airflow to parse the file is left to the
+        deploy job (app.services.deploys), which does it without blocking.
 
         Args:
-            workflow: Workflow model instance
-            tasks: List of Task model instances
+            workflow_id: Workflow UUID as string
+            dag_code: Code returned by generate_dag_code
 
         Returns:
-            Path to the created DAG file
+            DagPublishResult with the file path, content hash and whether it was written
         """
-        # Generate DAG code
-        dag_code = self.generate_dag_code(workflow, tasks)
+        # Drop a factory entry first: Airflow rejects a DAG ID defined by two files
+        self._remove_snapshot_entry(workflow_id)
 
-        # Create DAG file
-        dag_filename = f"workflow_{workflow.id}.py"
-        dag_file_path = self.dags_folder / dag_filename
+        dag_file_path = self.dag_file_path(workflow_id)
+        dag_hash = content_hash(dag_code)
+        changed = _write_file_atomic(dag_file_path, f"{DAG_HASH_HEADER}{dag_hash}\n{dag_code}")
+        return DagPublishResult(dag_file_path, dag_hash, changed)
 
-        # Write DAG file
-        dag_file_path.write_text(dag_code, encoding='utf-8')
+    def read_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the DAG factory snapshot
 
-        # Auto-unpause DAG in Airflow (with longer retry window for DAG serialization)
-        dag_id = f"workflow_{workflow.id}"
-        self.unpause_dag(dag_id, max_retries=20, retry_delay=5)
+        Returns:
+            Snapshot entries keyed by workflow ID (empty if there is no snapshot)
+        """
+        content = _read_file(self.snapshot_path)
+        if content is None:
+            return {}
+        return {entry["workflow_id"]: entry for entry in json.loads(content)["workflows"]}
+
+    def _write_snapshot(self, entries: Dict[str, Dict[str, Any]]) -> DagPublishResult:
+        """Publish snapshot entries (ordered by workflow ID) with the snapshot's hash"""
+        snapshot = _canonical_json({"workflows": [entries[workflow_id] for workflow_id in sorted(entries)]})
+        changed = _write_file_atomic(self.snapshot_path, snapshot)
+        return DagPublishResult(self.snapshot_path, content_hash(snapshot), changed)
+
+    def _publish_factory(self) -> bool:
+        """(Re)publish the factory module if it differs from the backend's rendering"""
+        factory_code = self.environment.get_template(DAG_FACTORY_TEMPLATE_NAME).render()
+        return _write_file_atomic(self.factory_file_path, factory_code)
+
+    def publish_snapshot(self, entries: Iterable[Dict[str, Any]]) -> DagPublishResult:
+        """
+        Publish a complete DAG factory snapshot, replacing the current one
+
+        For bulk publishing (e.g. moving every workflow to factory mode); the
+        per-workflow DAG files of the published workflows are removed.
 
-        return dag_file_path
+        Args:
+            entries: Entries from snapshot_entry
+
+        Returns:
+            DagPublishResult with the snapshot path, the snapshot's hash and
+            whether it was written
+        """
+        entries_by_id = {entry["workflow_id"]: entry for entry in entries}
+        self._publish_factory()
+        # Remove per-workflow files first: Airflow rejects a DAG ID defined by two files
+        for workflow_id in entries_by_id:
+            self.dag_file_path(workflow_id).unlink(missing_ok=True)
+        return self._write_snapshot(entries_by_id)
+
+    def publish_snapshot_entry(
+        self,
+        entry: Dict[str, Any],
+        keep_workflow_ids: Optional[Iterable[str]] = None
+    ) -> DagPublishResult:
+        """
+        Publish a workflow to the DAG factory snapshot
+
+        The factory module is (re)published if it differs from the backend's
+        copy, the workflow's own DAG file is removed, and its entry is added
+        or replaced. Like publish_dag, an unchanged snapshot is not rewritten.
+
+        Args:
+            entry: Entry from snapshot_entry
+            keep_workflow_ids: If given, other entries are kept only for these
+                workflows (drops deleted and deactivated workflows)
+
+        Returns:
+            DagPublishResult with the snapshot path, the entry's hash and whether
+            the snapshot was written
+        """
+        workflow_id = entry["workflow_id"]
+        self._publish_factory()
+
+        # Remove the per-workflow file first: Airflow rejects a DAG ID defined by two files
+        self.dag_file_path(workflow_id).unlink(missing_ok=True)
+
+        entries = self.read_snapshot()
+        if keep_workflow_ids is not None:
+            keep = set(keep_workflow_ids)
+            entries = {key: value for key, value in entries.items() if key in keep}
+        entries[workflow_id] = entry
+        result = self._write_snapshot(entries)
+        return DagPublishResult(self.snapshot_path, entry["hash"], result.changed)
+
+    def _remove_snapshot_entry(self, workflow_id: str) -> bool:
+        """Remove a workflow from the snapshot; True if it was there"""
+        entries = self.read_snapshot()
+        if workflow_id not in entries:
+            return False
+        del entries[workflow_id]
+        self._write_snapshot(entries)
+        return True
+
+    def verify_dag_files(self, recorded_hashes: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        Compare the hashes recorded for workflows with the files in the dags folder
+
+        A workflow in the factory snapshot is checked against its entry,
+        any other against its own DAG file. Each workflow gets one status:
+            ok: file (or entry) present, intact and matching the recorded hash
+            not_deployed: no recorded hash and no file
+            missing: a hash is recorded but the file is gone
+            unhashed: file has no hash header (published before hashes were recorded)
+            modified: content no longer matches its own hash (edited by hand)
+            mismatch: intact but differs from the recorded hash
+
+        Args:
+            recorded_hashes: Recorded hash (or None) keyed by workflow ID string
+
+        Returns:
+            Dict with per-workflow results, status counts and orphaned files
+            (workflow_*.py files and snapshot entries with no workflow)
+        """
+        snapshot = self.read_snapshot()
+        results = []
+        counts: Dict[str, int] = {}
+        for workflow_id, recorded in recorded_hashes.items():
+            file_hash = None
+            entry = snapshot.get(workflow_id)
+            if entry is not None:
+                dag_file = self.snapshot_path
+                file_hash = entry.get("hash")
+                body = {key: value for key, value in entry.items() if key != "hash"}
+                if content_hash(_canonical_json(body)) != file_hash:
+                    result_status = "modified"
+                elif file_hash != recorded:
+                    result_status = "mismatch"
+                else:
+                    result_status = "ok"
+            else:
+                dag_file = self.dag_file_path(workflow_id)
+                content = _read_file(dag_file)
+                if content is None:
+                    result_status = "missing" if recorded else "not_deployed"
+                else:
+                    header, _, body_code = content.partition("\n")
+                    if not header.startswith(DAG_HASH_HEADER):
+                        result_status = "unhashed"
+                    else:
+                        file_hash = header[len(DAG_HASH_HEADER):].strip()
+                        if content_hash(body_code) != file_hash:
+                            result_status = "modified"
+                        elif file_hash != recorded:
+                            result_status = "mismatch"
+                        else:
+                            result_status = "ok"
+
+            counts[result_status] = counts.get(result_status, 0) + 1
+            results.append({
+                "workflow_id": workflow_id,
+                "dag_file": str(dag_file),
+                "status": result_status,
+                "recorded_hash": recorded,
+                "file_hash": file_hash,
+            })
+
+        orphaned = [
+            str(path) for path in self.dags_folder.glob("workflow_*.py")
+            if DAG_FILE_NAME.match(path.name).group(1) not in recorded_hashes
+        ]
+        orphaned += [
+            f"{self.snapshot_path}#{workflow_id}" for workflow_id in snapshot
+            if workflow_id not in recorded_hashes
+        ]
+        return {
+            "checked": len(results),
+            "counts": counts,
+            "workflows": results,
+            "orphaned_files": sorted(orphaned),
+        }
 
     def remove_dag(self, workflow_id: str) -> bool:
         """
-        Remove DAG file from Airflow dags folder
+        Remove a workflow's DAG file and factory snapshot entry
 
         Args:
             workflow_id: Workflow UUID as string
 
         Returns:
-            True if file was removed, False if it didn't exist
+            True if anything was removed, False if the workflow was not deployed
         """
-        dag_filename = f"workflow_{workflow_id}.py"
-        dag_file_path = self.dags_folder / dag_filename
+        dag_file_path = self.dag_file_path(workflow_id)
 
+        removed = self._remove_snapshot_entry(workflow_id)
         if dag_file_path.exists():
             dag_file_path.unlink()
-            return True
-        return False
+            removed = True
+        return removed
 
     def dag_exists(self, workflow_id: str) -> bool:
         """
-        Check if DAG file exists for a workflow
+        Check if a workflow is deployed (DAG file or factory snapshot entry)
 
         Args:
             workflow_id: Workflow UUID as string
 
         Returns:
-            True if DAG file exists, False otherwise
+            True if deployed, False otherwise
         """
-        dag_filename = f"workflow_{workflow_id}.py"
-        dag_file_path = self.dags_folder / dag_filename
-        return dag_file_path.exists()
+        dag_file_path = self.dag_file_path(workflow_id)
+        return dag_file_path.exists() or workflow_id in self.read_snapshot()
+
+
+# Process-wide generator (template environment and dags folder set up once)
+_shared_generator: Optional[DAGGenerator] = None
+
+
+def init_dag_generator(
+    dags_folder: str,
+    bytecode_cache_dir: Optional[str] = None,
+    mode: str = "files"
+) -> DAGGenerator:
+    """
+    Create the process-wide DAG generator if it does not exist yet
+
+    Args:
+        dags_folder: Path to the Airflow dags folder
+        bytecode_cache_dir: Directory for compiled template bytecode
+        mode: DAG deploy mode ("files" or "factory")
+
+    Returns:
+        The shared DAGGenerator
+    """
+    global _shared_generator
+    if _shared_generator is None:
+        _shared_generator = DAGGenerator(
+            dags_folder=dags_folder,
+            environment=create_template_environment(bytecode_cache_dir),
+            mode=mode
+        )
+    return _shared_generator
@@ -0,0 +1,378 @@
+"""
+Background DAG deploys
+A deploy renders the workflow's DAG file (or its DAG factory snapshot entry
+in factory mode), publishes it to the dags folder, waits for Airflow to parse
+it and unpauses it. Requests only submit the job and get
+its id back; progress is read from GET /workflows/deploys/{id}.
+
+Jobs live in this process's memory (like the change feed), so a deploy is
+reported by the API worker that accepted it.
+"""
+import asyncio
+import contextvars
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import httpx
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.task import Task
+from app.models.workflow import Workflow
+from app.services.airflow_client import AirflowClient
+from app.services.dag_generator import DAGGenerator, DagPublishResult
+
+# Phases in the order a deploy completes them
+DEPLOY_PHASES = ("rendered", "written", "parsed", "unpaused")
+
+ACTIVE_STATES = {"pending", "running"}
+
+
+class DeployFailed(Exception):
+    """A deploy cannot complete (import error, parse timeout, unpause refused)"""
+
+    def __init__(self, message: str, import_error: Optional[str] = None):
+        super().__init__(message)
+        self.import_error = import_error
+
+
+def _utc_naive(value: Optional[str]) -> Optional[datetime]:
+    """Parse an Airflow timestamp into naive UTC, like our own timestamps"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class DeployJob:
+    """State of one deploy"""
+
+    def __init__(self, workflow_id: str, dag_file: Path):
+        self.id = uuid.uuid4().hex
+        self.workflow_id = workflow_id
+        self.dag_id = f"workflow_{workflow_id}"
+        self.dag_file = dag_file
+        self.status = "pending"
+        self.phases: Dict[str, Optional[datetime]] = {phase: None for phase in DEPLOY_PHASES}
+        self.error: Optional[str] = None
+        self.import_error: Optional[str] = None
+        self.content_hash: Optional[str] = None
+        self.changed: Optional[bool] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def phase(self) -> Optional[str]:
+        """Last completed phase"""
+        done = [phase for phase in DEPLOY_PHASES if self.phases[phase] is not None]
+        return done[-1] if done else None
+
+    def complete(self, phase: str) -> None:
+        self.phases[phase] = datetime.utcnow()
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "workflow_id": self.workflow_id,
+            "dag_id": self.dag_id,
+            "dag_file": str(self.dag_file),
+            "status": self.status,
+            "phase": self.phase,
+            "phases": dict(self.phases),
+            "error": self.error,
+            "import_error": self.import_error,
+            "content_hash": self.content_hash,
+            "changed": self.changed,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class DeployManager:
+    """Runs deploy jobs as asyncio tasks and keeps their state for lookups"""
+
+    def __init__(
+        self,
+        history_size: int = settings.DEPLOY_HISTORY_SIZE,
+        parse_timeout: float = settings.DEPLOY_PARSE_TIMEOUT,
+        poll_backoff: float = settings.DEPLOY_POLL_BACKOFF,
+        poll_backoff_max: float = settings.DEPLOY_POLL_BACKOFF_MAX,
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            history_size: Finished jobs kept for lookups (oldest dropped first)
+            parse_timeout: Seconds to wait for Airflow to parse a DAG file
+            poll_backoff: First delay between parse checks in seconds
+            poll_backoff_max: Longest delay between parse checks
+        """
+        self.history_size = history_size
+        self.parse_timeout = parse_timeout
+        self.poll_backoff = poll_backoff
+        self.poll_backoff_max = poll_backoff_max
+        self._jobs: Dict[str, DeployJob] = {}
+        self._active_by_workflow: Dict[str, DeployJob] = {}
+        # Serializes dags folder writes: cancelling a job does not stop a write
+        # already running in a worker thread, and snapshot updates read-modify-write
+        self.write_lock = threading.Lock()
+
+        # Metrics
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.import_errors = 0
+        self.superseded = 0
+        self.unchanged = 0
+        self.parse_checks = 0
+
+    def submit(
+        self,
+        dag_gen: DAGGenerator,
+        airflow: AirflowClient,
+        workflow: Workflow,
+        tasks: List[Task]
+    ) -> DeployJob:
+        """
+        Start a deploy in the background
+
+        A deploy still running for the same workflow is cancelled: the new
+        file replaces it.
+
+        Args:
+            dag_gen: DAG generator
+            airflow: Airflow client
+            workflow: Workflow to deploy (attributes already loaded)
+            tasks: The workflow's tasks (attributes already loaded)
+
+        Returns:
+            The new job
+        """
+        workflow_id = str(workflow.id)
+        previous = self._active_by_workflow.get(workflow_id)
+        if previous is not None and previous.task is not None:
+            previous.task.cancel()
+
+        job = DeployJob(workflow_id, dag_gen.deployed_file_path(workflow_id))
+        self._jobs[job.id] = job
+        self._active_by_workflow[workflow_id] = job
+        self.submitted += 1
+        self._prune()
+
+        # Fresh context: the job outlives the submitting request's Airflow deadline
+        job.task = asyncio.create_task(
+            self._run(job, dag_gen, airflow, workflow, tasks),
+            context=contextvars.Context()
+        )
+        job.task.add_done_callback(lambda _: self._job_done(job))
+        return job
+
+    def get(self, deploy_id: str) -> Optional[DeployJob]:
+        """Get a job by id, if this process still has it"""
+        return self._jobs.get(deploy_id)
+
+    async def stop(self) -> None:
+        """Cancel running jobs and wait for them to exit"""
+        tasks = [job.task for job in self._active_by_workflow.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _job_done(self, job: DeployJob) -> None:
+        """Record a finished job (a task cancelled before it started never ran _run)"""
+        if job.status in ACTIVE_STATES:
+            job.finish("cancelled", "Superseded by a newer deploy or shutdown")
+            self.superseded += 1
+        if self._active_by_workflow.get(job.workflow_id) is job:
+            del self._active_by_workflow[job.workflow_id]
+        print(f"Deploy {job.id} of {job.dag_id}: {job.status}" + (f" ({job.error})" if job.error else ""))
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond history_size"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for deploy_id in [d for d, job in self._jobs.items() if job.status not in ACTIVE_STATES][:excess]:
+            del self._jobs[deploy_id]
+
+    async def _run(
+        self,
+        job: DeployJob,
+        dag_gen: DAGGenerator,
+        airflow: AirflowClient,
+        workflow: Workflow,
+        tasks: List[Task]
+    ) -> None:
+        """Run one deploy through its phases"""
+        job.status = "running"
+        try:
+            # Rendering validates the workflow, so a DAG that cannot be built
+            # fails here instead of waiting out the parse timeout (in factory
+            # mode Airflow would not report an import error for it)
+            try:
+                if dag_gen.mode == "factory":
+                    # The snapshot keeps deployed workflows that are still active
+                    keep_workflow_ids = await self._active_workflow_ids()
+                    entry = await asyncio.to_thread(dag_gen.snapshot_entry, workflow, tasks)
+                    publish = partial(dag_gen.publish_snapshot_entry, entry, keep_workflow_ids)
+                else:
+                    dag_code = await asyncio.to_thread(dag_gen.generate_dag_code, workflow, tasks)
+                    publish = partial(dag_gen.publish_dag, job.workflow_id, dag_code)
+            except ValueError as e:
+                raise DeployFailed(f"Workflow cannot be built into a DAG: {e}")
+            job.complete("rendered")
+
+            published = await asyncio.to_thread(self._publish_if_current, job, publish)
+            if published is None:
+                return  # Superseded; the newer deploy publishes the file
+            job.content_hash = published.content_hash
+            job.changed = published.changed
+            if not published.changed:
+                self.unchanged += 1
+            await self._record_hash(job)
+            job.complete("written")
+
+            # Compare against the file's mtime: an unchanged file was parsed long ago
+            # (in factory mode the DAG changes with either the snapshot or the factory module)
+            changed_files = [published.path, job.dag_file]
+            file_mtime = datetime.utcfromtimestamp(max(path.stat().st_mtime for path in changed_files))
+            await self._wait_until_parsed(job, airflow, file_mtime)
+            job.complete("parsed")
+
+            try:
+                await airflow.unpause_dag(job.dag_id)
+            except Exception as e:
+                raise DeployFailed(f"DAG parsed but could not be unpaused: {e}")
+            job.complete("unpaused")
+
+            job.finish("succeeded")
+            self.succeeded += 1
+        except DeployFailed as e:
+            job.import_error = e.import_error
+            job.finish("failed", str(e))
+            self.failed += 1
+        except Exception as e:
+            job.finish("failed", f"Failed to deploy workflow: {e}")
+            self.failed += 1
+
+    def _publish_if_current(
+        self,
+        job: DeployJob,
+        publish: Callable[[], DagPublishResult]
+    ) -> Optional[DagPublishResult]:
+        """Publish unless a newer deploy of the workflow was submitted (worker thread)"""
+        with self.write_lock:
+            if self._active_by_workflow.get(job.workflow_id) is not job:
+                return None
+            return publish()
+
+    async def _active_workflow_ids(self) -> Set[str]:
+        """IDs of active workflows"""
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(select(Workflow.id).where(Workflow.is_active.is_(True)))
+            return {str(workflow_id) for workflow_id in rows.scalars()}
+
+    async def _record_hash(self, job: DeployJob) -> None:
+        """Store the published content hash on the workflow (read by the verify endpoint)"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Workflow)
+                .where(Workflow.id == uuid.UUID(job.workflow_id), Workflow.dag_hash.is_distinct_from(job.content_hash))
+                # Deployment bookkeeping, not an edit of the workflow
+                .values(dag_hash=job.content_hash, updated_at=Workflow.updated_at)
+            )
+            await db.commit()
+
+    async def _wait_until_parsed(self, job: DeployJob, airflow: AirflowClient, written_at: datetime) -> None:
+        """
+        Wait for Airflow to parse the file as last modified at `written_at`
+
+        Checks back off exponentially. The job fails as soon as Airflow
+        reports an import error for the file, instead of waiting out the
+        timeout.
+
+        Raises:
+            DeployFailed: On an import error for the file or after parse_timeout
+        """
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.parse_timeout
+        last_error: Optional[str] = None
+        attempt = 0
+
+        while True:
+            self.parse_checks += 1
+            try:
+                for import_error in await airflow.list_import_errors():
+                    if PurePosixPath(import_error.get("filename") or "").name != job.dag_file.name:
+                        continue
+                    # Errors recorded before the file's last change belong to an earlier version
+                    reported_at = _utc_naive(import_error.get("timestamp"))
+                    if reported_at is None or reported_at >= written_at:
+                        self.import_errors += 1
+                        raise DeployFailed(
+                            f"Airflow could not import {job.dag_file.name}",
+                            import_error=import_error.get("stack_trace"),
+                        )
+
+                try:
+                    dag = await airflow.refresh_dag(job.dag_id)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code != 404:
+                        raise
+                    dag = None  # Not parsed yet
+
+                if dag is not None:
+                    parsed_at = _utc_naive(dag.get("last_parsed_time"))
+                    if parsed_at is None or parsed_at >= written_at:
+                        return
+            except DeployFailed:
+                raise
+            except Exception as e:
+                # Airflow briefly unavailable: keep checking until the timeout
+                last_error = str(e)
+
+            remaining = give_up_at - loop.time()
+            if remaining <= 0:
+                detail = f" (last error: {last_error})" if last_error else ""
+                raise DeployFailed(
+                    f"Airflow did not parse {job.dag_file.name} within {self.parse_timeout:g}s{detail}"
+                )
+            delay = min(self.poll_backoff_max, self.poll_backoff * (2 ** attempt))
+            await asyncio.sleep(min(delay, remaining))
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get deploy metrics
+
+        Returns:
+            Dict with job counters
+        """
+        return {
+            "active": len(self._active_by_workflow),
+            "tracked": len(self._jobs),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "import_errors": self.import_errors,
+            "superseded": self.superseded,
+            "unchanged": self.unchanged,
+            "parse_checks": self.parse_checks,
+        }
+
+
+# Process-wide manager; running jobs are cancelled by the application lifespan
+deploy_manager = DeployManager()
@@ -0,0 +1,225 @@
+"""
+Conditional GET support
+Strong ETags derived from per-table change versions, so an unchanged poll is
+answered with 304 after a few index lookups instead of a full query and
+serialization
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Response, status
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import engine
+
+# Whether the change version tables (and their triggers) exist; checked once per process
+_versions_available: Optional[bool] = None
+
+# A table's version is its folded count plus the log rows not yet folded in;
+# both are read in one statement, so a concurrent compaction never shows
+_VERSIONS_QUERY = text(
+    "SELECT v.table_name, v.version + ("
+    "    SELECT count(*) FROM change_version_log l WHERE l.table_name = v.table_name"
+    ") AS version "
+    "FROM change_versions v WHERE v.table_name IN :tables"
+).bindparams(bindparam("tables", expanding=True))
+
+# Fold the log into change_versions; only rows this statement deletes are added,
+# so rows committed meanwhile are counted by the next pass
+COMPACT_CHANGE_VERSIONS = text("""
+    WITH folded AS (
+        DELETE FROM change_version_log RETURNING table_name
+    ), counts AS (
+        SELECT table_name, count(*) AS changes FROM folded GROUP BY table_name
+    ), updated AS (
+        UPDATE change_versions v SET version = v.version + counts.changes
+        FROM counts WHERE v.table_name = counts.table_name
+        RETURNING counts.changes
+    )
+    SELECT coalesce(sum(changes), 0) FROM updated
+""")
+
+
+def get_table_versions(db: Session, tables: Iterable[str]) -> Optional[Dict[str, int]]:
+    """
+    Read the change versions of a set of tables
+
+    Every write statement appends a row to change_version_log in the writing
+    transaction (see the e4a9c2d7f1b6 migration), so a version counts the
+    committed writes and writers never wait on a shared counter row. Read
+    versions before the data they describe, so a concurrent commit can only
+    make the ETag older than the body, never newer.
+
+    Args:
+        db: Database session
+        tables: Table names
+
+    Returns:
+        Version per table, or None if the database has no change version tables
+        (e.g. created with create_all instead of migrations)
+    """
+    global _versions_available
+    if _versions_available is None:
+        _versions_available = db.execute(
+            text("SELECT to_regclass('change_version_log') IS NOT NULL")
+        ).scalar()
+    if not _versions_available:
+        return None
+
+    rows = db.execute(_VERSIONS_QUERY, {"tables": sorted(set(tables))}).all()
+    return {row.table_name: row.version for row in rows}
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from version components
+
+    Args:
+        parts: Anything that identifies the representation (versions, query params, ...)
+
+    Returns:
+        Quoted ETag value
+    """
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """304 response for a matching If-None-Match"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers for a response carrying an ETag (clients must revalidate every time)"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def record_change(conn: Connection, table: str) -> None:
+    """Count a change the triggers cannot see (e.g. dropping a partition) in a table's version"""
+    conn.execute(text("INSERT INTO change_version_log (table_name) VALUES (:table)"), {"table": table})
+
+
+def compact_change_versions() -> int:
+    """
+    Fold committed change log rows into change_versions
+
+    Keeps the version reads short; versions are unchanged by a compaction.
+
+    Returns:
+        Number of log rows folded (0 if the database has no change version tables)
+    """
+    with engine.connect() as conn:
+        if not conn.execute(text("SELECT to_regclass('change_version_log') IS NOT NULL")).scalar():
+            return 0
+        folded = conn.execute(COMPACT_CHANGE_VERSIONS).scalar()
+        conn.commit()
+    return int(folded)
+
+
+class ChangeVersionCompactor:
+    """Periodically runs compact_change_versions in a worker thread"""
+
+    def __init__(self, interval: float = settings.CHANGE_VERSIONS_COMPACT_INTERVAL):
+        """
+        Initialize the compactor
+
+        Args:
+            interval: Seconds between compactions
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.passes = 0
+        self.errors = 0
+        self.rows_folded = 0
+        self.last_pass_completed_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and wait for it to exit"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Compact until cancelled"""
+        while True:
+            try:
+                self.rows_folded += await asyncio.to_thread(compact_change_versions)
+                self.passes += 1
+                self.last_pass_completed_at = time.time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Change version compaction failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get compaction metrics
+
+        Returns:
+            Dict with pass counters and the rows folded so far
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "passes": self.passes,
+            "errors": self.errors,
+            "rows_folded": self.rows_folded,
+            "last_pass_seconds_ago": (
+                round(time.time() - self.last_pass_completed_at, 3)
+                if self.last_pass_completed_at is not None else None
+            ),
+        }
+
+
+# Process-wide compactor, started and stopped by the application lifespan
+_compactor: Optional[ChangeVersionCompactor] = None
+
+
+def get_change_version_compactor() -> Optional[ChangeVersionCompactor]:
+    """Get the running compactor, if the application started one"""
+    return _compactor
+
+
+def start_change_version_compactor() -> ChangeVersionCompactor:
+    """Create and start the process-wide compactor"""
+    global _compactor
+    if _compactor is None:
+        _compactor = ChangeVersionCompactor()
+        _compactor.start()
+    return _compactor
+
+
+async def stop_change_version_compactor() -> None:
+    """Stop the process-wide compactor"""
+    global _compactor
+    if _compactor is not None:
+        await _compactor.stop()
+        _compactor = None
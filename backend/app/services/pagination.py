@@ -0,0 +1,108 @@
+"""
+Keyset (cursor) pagination for newest-first listings
+Pages are keyed on (created_at, id), so a deep page costs the same index range
+scan as the first one, and totals default to a planner estimate instead of a
+full COUNT(*)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import Query, Session
+
+
+class Page(NamedTuple):
+    """One page of a listing"""
+    items: List[Any]
+    total: int
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Opaque cursor pointing just past a row"""
+    payload = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """Row count the planner expects for a query (from table statistics, no scan)"""
+    statement = query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(
+    db: Session,
+    query: Query,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    exact_total: bool = False,
+) -> Page:
+    """
+    Fetch one newest-first page of a filtered query
+
+    With a cursor, rows after it are read by (created_at, id) and skip is
+    ignored; without one, skip is applied as an offset for compatibility with
+    page-number clients. Either way the page carries a cursor for the next one.
+
+    Args:
+        db: Database session
+        query: Filtered query over model
+        model: Mapped class with created_at and id columns
+        limit: Page size
+        cursor: next_cursor from the previous page
+        skip: Offset, used only without a cursor
+        exact_total: Run COUNT(*) instead of estimating the total
+
+    Returns:
+        The page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if exact_total:
+        total = query.count()
+
+    ordered = query.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        ordered = ordered.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    elif skip:
+        ordered = ordered.offset(skip)
+
+    # One extra row tells us whether there is a next page
+    rows = ordered.limit(limit + 1).all() if limit > 0 else []
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+
+    if not exact_total:
+        if limit > 0 and not cursor and not skip and not has_more:
+            # The whole result fit on the first page, so its size is exact
+            exact_total, total = True, len(items)
+        else:
+            seen = (0 if cursor else skip) + len(items) + (1 if has_more else 0)
+            total = max(estimate_count(db, query), seen)
+
+    return Page(items=items, total=total, total_is_estimate=not exact_total, next_cursor=next_cursor)
@@ -0,0 +1,267 @@
+"""
+Monthly partition maintenance for job_runs
+Creates upcoming job_runs_pYYYYMM partitions and retires months past the
+retention period: their rows (and task runs) are archived to gzip NDJSON,
+then the partition is detached and dropped, so removing old data never
+runs a large DELETE over job_runs
+"""
+import asyncio
+import gzip
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.etag import record_change
+
+# Arbitrary key for the advisory lock that keeps one maintainer per database
+MAINTENANCE_LOCK_KEY = 0x6A6F6272756E73
+
+PARTITION_NAME = re.compile(r"^job_runs_p(\d{4})(\d{2})$")
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """First day of the month `months` after (or before) `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"job_runs_p{month:%Y%m}"
+
+
+def _is_partitioned(conn: Connection) -> bool:
+    """Whether job_runs is a partitioned table (false for pre-migration databases)"""
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('job_runs')")
+    ).scalar() is True
+
+
+def _list_partitions(conn: Connection) -> Dict[datetime, str]:
+    """Attached monthly partitions keyed by the month they hold"""
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'job_runs'::regclass"
+    )).scalars()
+    partitions = {}
+    for name in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _copy_to_gzip(conn: Connection, query: str, path: str) -> None:
+    """Stream a query's rows as NDJSON into a gzip file (written atomically)"""
+    tmp_path = f"{path}.tmp"
+    cursor = conn.connection.cursor()
+    try:
+        with gzip.open(tmp_path, "wb") as archive:
+            # Text-format COPY escapes backslashes, which JSON relies on; csv with
+            # unused quote/delimiter characters passes each line through unchanged
+            cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')",
+                archive,
+            )
+    finally:
+        cursor.close()
+    os.replace(tmp_path, path)
+
+
+def _archive_partition(conn: Connection, month: datetime, name: str, archive_dir: str) -> None:
+    """Archive one partition and its task runs, then detach and drop it"""
+    os.makedirs(archive_dir, exist_ok=True)
+    _copy_to_gzip(
+        conn,
+        f"SELECT row_to_json(j) FROM {name} j",
+        os.path.join(archive_dir, f"job_runs_{month:%Y%m}.ndjson.gz"),
+    )
+    _copy_to_gzip(
+        conn,
+        f"SELECT row_to_json(t) FROM task_runs t WHERE t.job_run_id IN (SELECT id FROM {name})",
+        os.path.join(archive_dir, f"task_runs_{month:%Y%m}.ndjson.gz"),
+    )
+
+    # Commit with the copies; the rollup keeps counting these runs (history), but ETags must see them go
+    conn.execute(text(f"DELETE FROM task_runs WHERE job_run_id IN (SELECT id FROM {name})"))
+    conn.execute(text(f"ALTER TABLE job_runs DETACH PARTITION {name}"))
+    conn.execute(text(f"DROP TABLE {name}"))
+    if conn.execute(text("SELECT to_regclass('change_version_log') IS NOT NULL")).scalar():
+        record_change(conn, "job_runs")
+    conn.commit()
+
+
+def maintain_partitions(
+    months_ahead: int = settings.JOB_RUNS_PARTITIONS_AHEAD,
+    retention_months: int = settings.JOB_RUNS_RETENTION_MONTHS,
+    archive_dir: str = settings.JOB_RUNS_ARCHIVE_DIR,
+    now: Optional[datetime] = None,
+) -> Dict[str, List[str]]:
+    """
+    Create upcoming partitions and archive expired ones
+
+    Args:
+        months_ahead: Months past the current one that must have a partition
+        retention_months: Full months kept before the current one (0 = keep all)
+        archive_dir: Directory for archived partitions
+        now: Current time (UTC)
+
+    Returns:
+        Names of the partitions created and archived (empty if another
+        process holds the maintenance lock)
+    """
+    result: Dict[str, List[str]] = {"created": [], "archived": []}
+    current = month_start(now or datetime.utcnow())
+
+    with engine.connect() as conn:
+        # Session-level lock: held across the transactions below
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar()
+        conn.commit()
+        if not locked:
+            return result
+        try:
+            if not _is_partitioned(conn):
+                return result
+
+            partitions = _list_partitions(conn)
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if month not in partitions:
+                    name = partition_name(month)
+                    conn.execute(text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF job_runs "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                    ))
+                    result["created"].append(name)
+            conn.commit()
+
+            if retention_months > 0:
+                cutoff = add_months(current, -retention_months)
+                for month, name in sorted(partitions.items()):
+                    if month < cutoff:
+                        _archive_partition(conn, month, name, archive_dir)
+                        result["archived"].append(name)
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            conn.commit()
+
+    return result
+
+
+class PartitionMaintainer:
+    """Periodically runs maintain_partitions in a worker thread"""
+
+    def __init__(self, interval: float = settings.JOB_RUNS_PARTITION_MAINTENANCE_INTERVAL):
+        """
+        Initialize the maintainer
+
+        Args:
+            interval: Seconds between maintenance passes
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.passes = 0
+        self.errors = 0
+        self.partitions_created = 0
+        self.partitions_archived = 0
+        self.last_pass_completed_at: Optional[float] = None
+        self.last_archived: List[str] = []
+
+    def start(self) -> None:
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and wait for it to exit"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Run maintenance passes until cancelled"""
+        while True:
+            try:
+                await self.maintain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Partition maintenance pass failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def maintain_once(self) -> Dict[str, List[str]]:
+        """Run one maintenance pass"""
+        result = await asyncio.to_thread(maintain_partitions)
+        self.passes += 1
+        self.partitions_created += len(result["created"])
+        self.partitions_archived += len(result["archived"])
+        if result["archived"]:
+            self.last_archived = result["archived"]
+        self.last_pass_completed_at = time.time()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get maintenance metrics
+
+        Returns:
+            Dict with pass counters and the last archived partitions
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "passes": self.passes,
+            "errors": self.errors,
+            "partitions_created": self.partitions_created,
+            "partitions_archived": self.partitions_archived,
+            "last_pass_seconds_ago": (
+                round(time.time() - self.last_pass_completed_at, 3)
+                if self.last_pass_completed_at is not None else None
+            ),
+            "last_archived": self.last_archived,
+            "retention_months": settings.JOB_RUNS_RETENTION_MONTHS,
+        }
+
+
+# Process-wide maintainer, started and stopped by the application lifespan
+_maintainer: Optional[PartitionMaintainer] = None
+
+
+def get_partition_maintainer() -> Optional[PartitionMaintainer]:
+    """Get the running maintainer, if the application started one"""
+    return _maintainer
+
+
+def start_partition_maintainer() -> PartitionMaintainer:
+    """Create and start the process-wide maintainer"""
+    global _maintainer
+    if _maintainer is None:
+        _maintainer = PartitionMaintainer()
+        _maintainer.start()
+    return _maintainer
+
+
+async def stop_partition_maintainer() -> None:
+    """Stop the process-wide maintainer"""
+    global _maintainer
+    if _maintainer is not None:
+        await _maintainer.stop()
+        _maintainer = None
@@ -0,0 +1,194 @@
+"""
+Failure handling for outbound Airflow calls
+Circuit breaker, jittered retry backoff and per-request deadline budgets
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+
+class AirflowUnavailableError(Exception):
+    """Raised when an Airflow call is refused without contacting Airflow"""
+
+
+class CircuitOpenError(AirflowUnavailableError):
+    """Raised when the circuit breaker is open"""
+
+
+class DeadlineExceeded(AirflowUnavailableError):
+    """Raised when the request's Airflow time budget is used up"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing
+
+    closed    -> calls pass; ``failure_threshold`` consecutive failures open it
+    open      -> calls fail fast until ``recovery_timeout`` has elapsed
+    half_open -> a single probe call is let through; success closes the
+                 circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to stay open before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout elapses"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        Returns:
+            True if the call is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already running
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError("Airflow circuit breaker is open")
+
+    def record_success(self) -> None:
+        """Record a call that reached Airflow and got an answer"""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Forget a probe that ended without an answer either way (e.g. cancelled)"""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a call that failed because Airflow was unreachable or erroring"""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker counters
+
+        Returns:
+            Dict with state and counters
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Delay in seconds, uniformly drawn from [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class Deadline:
+    """Absolute point in time by which outbound calls must finish"""
+
+    def __init__(self, budget: float):
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Seconds left in the budget (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("airflow_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the current request, if any"""
+    return _current_deadline.get()
+
+
+def detached_context(budget: Optional[float]) -> Context:
+    """
+    Context for background work that outlives the request that started it
+
+    The work gets its own deadline instead of inheriting the remainder of
+    the request's budget.
+
+    Args:
+        budget: Seconds available, or None for no deadline
+    """
+    context = Context()
+    context.run(_current_deadline.set, Deadline(budget) if budget is not None else None)
+    return context
+
+
+@contextmanager
+def deadline_scope(budget: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Share one time budget between all Airflow calls made inside the block
+
+    Args:
+        budget: Seconds available, or None for no deadline
+    """
+    deadline = Deadline(budget) if budget is not None else None
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class AirflowDeadlineMiddleware:
+    """ASGI middleware giving each HTTP request its own Airflow time budget"""
+
+    def __init__(self, app, budget: float):
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with deadline_scope(self.budget):
+            await self.app(scope, receive, send)
@@ -0,0 +1,104 @@
+"""
+Ingestion of run state events pushed by the Airflow listener plugin
+"""
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.models.job_run import JobRun
+from app.schemas.run_event import RunStateEvent
+from app.services.run_updates import (
+    bulk_apply_run_updates,
+    publish_status_changes,
+    run_update_from_airflow,
+)
+from app.services.task_runs import bulk_upsert_task_runs, task_run_row
+
+# DAG run identity: run IDs such as scheduled__<ts> repeat across DAGs
+RunKey = Tuple[str, str]
+
+
+def latest_dag_run_events(events: List[RunStateEvent]) -> Dict[RunKey, RunStateEvent]:
+    """
+    Keep only the newest dag_run event per DAG run
+
+    Events without a timestamp are ordered by their position in the batch.
+
+    Args:
+        events: Events in the order they were sent
+
+    Returns:
+        Latest event keyed by (dag_id, run_id)
+    """
+    latest: Dict[RunKey, Tuple[tuple, RunStateEvent]] = {}
+    for position, event in enumerate(events):
+        if event.type != "dag_run":
+            continue
+        key = (event.dag_id, event.run_id)
+        order = (event.ts.timestamp() if event.ts else float("-inf"), position)
+        current = latest.get(key)
+        if current is None or order >= current[0]:
+            latest[key] = (order, event)
+    return {key: event for key, (_, event) in latest.items()}
+
+
+def _job_run_key(dag_id: str, run_id: str) -> Optional[Tuple[UUID, str]]:
+    """(workflow_id, dag_run_id) of a workflow DAG's run, or None for other DAGs"""
+    if not dag_id.startswith("workflow_"):
+        return None
+    try:
+        return UUID(dag_id[len("workflow_"):]), run_id
+    except ValueError:
+        return None
+
+
+def ingest_run_events(db: Session, events: List[RunStateEvent]) -> int:
+    """
+    Apply a batch of pushed events to job runs and task runs in bulk, with one commit
+
+    A late non-terminal event never moves a finished job run back to running.
+
+    Args:
+        db: Database session
+        events: Events from the listener
+
+    Returns:
+        Number of job runs updated
+    """
+    latest = latest_dag_run_events(events)
+    task_events = [event for event in events if event.type == "task_instance" and event.task_id]
+    run_keys = set(latest) | {(event.dag_id, event.run_id) for event in task_events}
+    job_run_keys = {key for key in (_job_run_key(*run_key) for run_key in run_keys) if key}
+    if not job_run_keys:
+        return 0
+
+    rows = db.query(JobRun.id, JobRun.workflow_id, JobRun.dag_run_id, JobRun.status).filter(
+        tuple_(JobRun.workflow_id, JobRun.dag_run_id).in_(list(job_run_keys))
+    ).all()
+    row_keys = {row.id: (f"workflow_{row.workflow_id}", row.dag_run_id) for row in rows}
+
+    updates = [
+        run_update_from_airflow(row.id, row.status, latest[row_keys[row.id]].model_dump(mode="json"))
+        for row in rows
+        if row_keys[row.id] in latest
+    ]
+
+    job_run_ids = {key: job_run_id for job_run_id, key in row_keys.items()}
+    task_rows = [
+        task_run_row(
+            job_run_ids[(event.dag_id, event.run_id)],
+            event.model_dump(mode="json"),
+            queued_key="queued_at"
+        )
+        for event in task_events
+        if (event.dag_id, event.run_id) in job_run_ids
+    ]
+
+    changed = bulk_apply_run_updates(db, updates)
+    bulk_upsert_task_runs(db, task_rows)
+    db.commit()
+
+    publish_status_changes(changed, {row.id: row.status for row in rows})
+    return len(changed)
@@ -0,0 +1,389 @@
+"""
+Background reconciliation of job run state with Airflow
+Keeps non-terminal job runs in sync without doing Airflow work on the request path
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job_run import JobRun
+from app.services.airflow_client import AirflowClient
+from app.services.airflow_metadata import get_airflow_metadata
+from app.services.run_updates import (
+    NON_TERMINAL_STATES,
+    RunUpdate,
+    bulk_apply_run_updates,
+    publish_status_changes,
+    run_update_from_airflow,
+)
+from app.services.task_runs import bulk_upsert_task_runs, fetch_task_run_rows
+
+# Airflow stamps the logical date slightly before we record started_at
+BATCH_SYNC_LOOKBACK = timedelta(minutes=5)
+
+
+async def fetch_dag_runs(
+    airflow: AirflowClient,
+    job_runs: Iterable[Any]
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Fetch the Airflow DAG runs backing a set of job runs in one batch lookup
+
+    Reads Airflow's dag_run table directly when AIRFLOW_STATE_SOURCE is
+    "database", otherwise (or if that fails) uses the REST batch endpoint;
+    runs older than RUN_RECONCILER_MAX_RUN_AGE are then fetched one by one.
+
+    Args:
+        airflow: Airflow client
+        job_runs: Objects with workflow_id, dag_run_id and created_at attributes
+
+    Returns:
+        Airflow DAG runs keyed by (dag_id, dag_run_id)
+    """
+    job_runs = [jr for jr in job_runs if jr.dag_run_id]
+    if not job_runs:
+        return {}
+
+    metadata = get_airflow_metadata()
+    if metadata is not None:
+        try:
+            return await asyncio.to_thread(
+                metadata.get_dag_runs,
+                [(f"workflow_{jr.workflow_id}", jr.dag_run_id) for jr in job_runs]
+            )
+        except Exception as e:
+            print(f"Failed to read DAG runs from Airflow's database, using the REST API: {e}")
+
+    # The batch query's window starts at the oldest run, so runs past the
+    # maximum age (e.g. one Airflow no longer has) are looked up one by one
+    cutoff = stale_run_cutoff()
+    recent = [jr for jr in job_runs if jr.created_at >= cutoff]
+    stale = [jr for jr in job_runs if jr.created_at < cutoff]
+
+    airflow_runs: List[Dict[str, Any]] = []
+    if recent:
+        dag_ids = sorted({f"workflow_{jr.workflow_id}" for jr in recent})
+        oldest = min(jr.created_at for jr in recent) - BATCH_SYNC_LOOKBACK
+        airflow_runs = await airflow.list_dag_runs_batch(
+            dag_ids,
+            execution_date_gte=oldest.isoformat() + "Z"
+        )
+    stale_runs = await asyncio.gather(*(
+        _get_dag_run_if_exists(airflow, f"workflow_{jr.workflow_id}", jr.dag_run_id)
+        for jr in stale
+    ))
+    airflow_runs.extend(run for run in stale_runs if run is not None)
+    return {
+        (run.get("dag_id"), run.get("dag_run_id")): run
+        for run in airflow_runs
+    }
+
+
+async def _get_dag_run_if_exists(
+    airflow: AirflowClient,
+    dag_id: str,
+    dag_run_id: str
+) -> Optional[Dict[str, Any]]:
+    """A DAG run, or None if Airflow has no such run (other errors propagate)"""
+    try:
+        return await airflow.get_dag_run(dag_id, dag_run_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return None
+        raise
+
+
+def stale_run_cutoff() -> datetime:
+    """Pending job runs created before this are failed once Airflow has no DAG run for them"""
+    return datetime.utcnow() - timedelta(seconds=settings.RUN_RECONCILER_MAX_RUN_AGE)
+
+
+def pending_runs_query(db: Session, job_run_ids: Optional[Iterable[Any]] = None) -> Query:
+    """
+    Query identifiers of job runs that can still change state, oldest first
+
+    Args:
+        db: Database session
+        job_run_ids: Restrict to these job runs (default: all pending runs)
+    """
+    query = db.query(
+        JobRun.id,
+        JobRun.workflow_id,
+        JobRun.dag_run_id,
+        JobRun.status,
+        JobRun.created_at,
+    ).filter(
+        JobRun.status.in_(NON_TERMINAL_STATES),
+        JobRun.dag_run_id.isnot(None),
+    )
+    if job_run_ids is not None:
+        query = query.filter(JobRun.id.in_(list(job_run_ids)))
+    return query.order_by(JobRun.created_at)
+
+
+def load_pending_runs(job_run_ids: Optional[Iterable[Any]] = None) -> List[Any]:
+    """
+    Load identifiers of job runs that can still change state
+
+    Args:
+        job_run_ids: Restrict to these job runs (default: all pending runs)
+
+    Returns:
+        Rows with id, workflow_id, dag_run_id, status and created_at
+    """
+    db = SessionLocal()
+    try:
+        return pending_runs_query(db, job_run_ids).all()
+    finally:
+        db.close()
+
+
+def _apply_updates(updates: List[RunUpdate], task_rows: List[Dict[str, Any]]) -> List[Any]:
+    """Write a batch of synced run and task states in one transaction"""
+    if not updates and not task_rows:
+        return []
+
+    db = SessionLocal()
+    try:
+        changed = bulk_apply_run_updates(db, updates)
+        bulk_upsert_task_runs(db, task_rows)
+        db.commit()
+        return changed
+    finally:
+        db.close()
+
+
+async def sync_run_batch(airflow: AirflowClient, batch: List[Any]) -> int:
+    """
+    Sync one batch of pending job runs (and their tasks) from Airflow
+
+    Args:
+        airflow: Airflow client
+        batch: Rows from load_pending_runs
+
+    Returns:
+        Number of job runs whose status changed
+    """
+    runs_by_key, task_rows = await asyncio.gather(
+        fetch_dag_runs(airflow, batch),
+        fetch_task_run_rows(airflow, batch),
+    )
+    cutoff = stale_run_cutoff()
+    updates = []
+    for row in batch:
+        airflow_run = runs_by_key.get((f"workflow_{row.workflow_id}", row.dag_run_id))
+        if airflow_run:
+            updates.append(run_update_from_airflow(row.id, row.status, airflow_run))
+        elif row.created_at < cutoff:
+            # Airflow no longer knows this run (DAG deleted, metadata cleaned up):
+            # fail it so it leaves the pending set
+            updates.append(RunUpdate(row.id, "failed", None, datetime.utcnow()))
+    changed = await asyncio.to_thread(_apply_updates, updates, task_rows)
+
+    previous_status = {row.id: row.status for row in batch}
+    publish_status_changes(changed, previous_status)
+    return sum(1 for row in changed if row.status != previous_status.get(row.id))
+
+
+async def sync_job_runs(airflow: AirflowClient, job_run_ids: Iterable[Any]) -> int:
+    """
+    Sync specific job runs from Airflow outside the reconciler loop
+
+    Args:
+        airflow: Airflow client
+        job_run_ids: Job runs to sync (finished ones are skipped)
+
+    Returns:
+        Number of job runs whose status changed
+    """
+    pending = await asyncio.to_thread(load_pending_runs, job_run_ids)
+    if not pending:
+        return 0
+    return await sync_run_batch(airflow, pending)
+
+
+class RunReconciler:
+    """Periodically syncs all non-terminal job runs from Airflow in batches"""
+
+    def __init__(
+        self,
+        airflow: AirflowClient,
+        interval: float = settings.RUN_RECONCILER_INTERVAL,
+        push_interval: float = settings.RUN_RECONCILER_PUSH_INTERVAL,
+        batch_size: int = settings.RUN_RECONCILER_BATCH_SIZE,
+        concurrency: int = settings.RUN_RECONCILER_CONCURRENCY,
+    ):
+        """
+        Initialize the reconciler
+
+        Args:
+            airflow: Airflow client used for batch lookups
+            interval: Seconds between reconcile passes
+            push_interval: Seconds between passes while pushed events are arriving
+            batch_size: Job runs per Airflow batch request
+            concurrency: Maximum batches in flight at once
+        """
+        self.airflow = airflow
+        self.interval = interval
+        self.push_interval = push_interval
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+        self.last_push_at: Optional[float] = None
+
+        # Metrics
+        self.passes = 0
+        self.errors = 0
+        self.runs_updated = 0
+        self.last_pass_started_at: Optional[float] = None
+        self.last_pass_completed_at: Optional[float] = None
+        self.last_pass_duration: Optional[float] = None
+        self.last_pending = 0
+        self.last_batch_sizes: List[int] = []
+
+    def start(self) -> None:
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and wait for it to exit"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Run reconcile passes until cancelled"""
+        while True:
+            try:
+                await self.reconcile_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Run reconciler pass failed: {e}")
+            await asyncio.sleep(self.current_interval())
+
+    def note_push_event(self) -> None:
+        """Record that the Airflow listener delivered events (polling can slow down)"""
+        self.last_push_at = time.monotonic()
+
+    def current_interval(self) -> float:
+        """Seconds until the next pass: slow while push events keep arriving"""
+        if self.last_push_at is not None and time.monotonic() - self.last_push_at < self.push_interval:
+            return self.push_interval
+        return self.interval
+
+    async def reconcile_once(self) -> int:
+        """
+        Sync every non-terminal job run with Airflow
+
+        Returns:
+            Number of job runs whose state changed
+        """
+        started = time.monotonic()
+        self.last_pass_started_at = time.time()
+
+        pending = await asyncio.to_thread(load_pending_runs)
+        batches = [
+            pending[i:i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+        self.last_pending = len(pending)
+        self.last_batch_sizes = [len(batch) for batch in batches]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync_batch(batch: List[Any]) -> int:
+            async with semaphore:
+                return await sync_run_batch(self.airflow, batch)
+
+        results = await asyncio.gather(
+            *(sync_batch(batch) for batch in batches),
+            return_exceptions=True
+        )
+        updated = 0
+        for result in results:
+            if isinstance(result, Exception):
+                self.errors += 1
+                print(f"Run reconciler batch failed: {result}")
+            else:
+                updated += result
+
+        self.passes += 1
+        self.runs_updated += updated
+        self.last_pass_completed_at = time.time()
+        self.last_pass_duration = time.monotonic() - started
+        return updated
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get reconciler metrics
+
+        Returns:
+            Dict with lag, batch sizes and counters
+        """
+        lag = None
+        if self.last_pass_started_at is not None:
+            # How old the freshest complete view of run state is
+            lag = round(time.time() - self.last_pass_started_at, 3)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.current_interval(),
+            "last_push_seconds_ago": (
+                round(time.monotonic() - self.last_push_at, 3) if self.last_push_at is not None else None
+            ),
+            "passes": self.passes,
+            "errors": self.errors,
+            "runs_updated": self.runs_updated,
+            "lag_seconds": lag,
+            "last_pass_duration_seconds": (
+                round(self.last_pass_duration, 3) if self.last_pass_duration is not None else None
+            ),
+            "pending_runs": self.last_pending,
+            "last_batch_sizes": self.last_batch_sizes,
+        }
+
+
+# Process-wide reconciler, started and stopped by the application lifespan
+_reconciler: Optional[RunReconciler] = None
+
+
+def get_run_reconciler() -> Optional[RunReconciler]:
+    """Get the running reconciler, if the application started one"""
+    return _reconciler
+
+
+def start_run_reconciler(airflow: AirflowClient) -> RunReconciler:
+    """
+    Create and start the process-wide reconciler
+
+    Args:
+        airflow: Airflow client used for batch lookups
+
+    Returns:
+        The started RunReconciler
+    """
+    global _reconciler
+    if _reconciler is None:
+        _reconciler = RunReconciler(airflow)
+        _reconciler.start()
+    return _reconciler
+
+
+async def stop_run_reconciler() -> None:
+    """Stop the process-wide reconciler"""
+    global _reconciler
+    if _reconciler is not None:
+        await _reconciler.stop()
+        _reconciler = None
@@ -0,0 +1,77 @@
+"""
+Job run statistics from the run_stats_hourly rollup
+Counts per (creation hour, workflow, status) are maintained by triggers on
+job_runs (see the 9e5a1c3f7b20 migration), so a stats read scans buckets
+rather than runs, however long the history
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.job_run import JobRun
+
+# Whether the run_stats_hourly table (and its triggers) exist; checked once per process
+_rollup_available: Optional[bool] = None
+
+
+def window_start(window: timedelta, now: Optional[datetime] = None) -> datetime:
+    """
+    Start of a stats window, rounded down to the rollup's hour buckets
+
+    A window therefore also covers the part of its first hour before now - window.
+    """
+    start = (now or datetime.utcnow()) - window
+    return start.replace(minute=0, second=0, microsecond=0)
+
+
+def count_runs_by_status(
+    db: Session,
+    since: Optional[datetime] = None,
+    workflow_id: Optional[UUID] = None,
+) -> Dict[str, int]:
+    """
+    Count job runs by current status
+
+    Args:
+        db: Database session
+        since: Only runs created at or after this time (use window_start)
+        workflow_id: Only runs of this workflow
+
+    Returns:
+        Run count per status (statuses without runs are omitted)
+    """
+    global _rollup_available
+    if _rollup_available is None:
+        _rollup_available = db.execute(
+            text("SELECT to_regclass('run_stats_hourly') IS NOT NULL")
+        ).scalar()
+
+    if not _rollup_available:
+        # Database created with create_all instead of migrations: count the runs
+        query = db.query(JobRun.status, func.count(JobRun.id))
+        if since is not None:
+            query = query.filter(JobRun.created_at >= since)
+        if workflow_id is not None:
+            query = query.filter(JobRun.workflow_id == workflow_id)
+        return {status: count for status, count in query.group_by(JobRun.status).all()}
+
+    conditions = ["TRUE"]
+    params = {}
+    if since is not None:
+        conditions.append("bucket >= :since")
+        params["since"] = since
+    if workflow_id is not None:
+        conditions.append("workflow_id = :workflow_id")
+        params["workflow_id"] = workflow_id
+
+    rows = db.execute(
+        text(
+            "SELECT status, SUM(run_count) AS run_count FROM run_stats_hourly "
+            f"WHERE {' AND '.join(conditions)} GROUP BY status HAVING SUM(run_count) > 0"
+        ),
+        params,
+    ).all()
+    return {row.status: int(row.run_count) for row in rows}
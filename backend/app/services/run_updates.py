@@ -0,0 +1,155 @@
+"""
+Set-based writes of synced job run state
+Applies many (job_run_id, status, started_at, ended_at) updates in one statement
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, String, and_, cast, column, func, not_, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.models.job_run import JobRun, NON_TERMINAL_STATES
+from app.services.change_feed import change_feed
+from app.services.run_waiters import run_waiters
+
+
+class RunUpdate(NamedTuple):
+    """New state for one job run (None timestamps leave the column unchanged)"""
+    job_run_id: UUID
+    status: str
+    started_at: Optional[datetime]
+    ended_at: Optional[datetime]
+
+
+def parse_airflow_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an Airflow ISO timestamp into naive UTC (the column type we store)"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def run_update_from_airflow(
+    job_run_id: UUID,
+    current_status: str,
+    airflow_run: Dict[str, Any]
+) -> RunUpdate:
+    """
+    Build a RunUpdate from an Airflow DAG run payload
+
+    Args:
+        job_run_id: Job run to update
+        current_status: Status currently stored for the job run
+        airflow_run: DAG run (or pushed event) with state/start_date/end_date
+
+    Returns:
+        RunUpdate for bulk_apply_run_updates
+    """
+    airflow_state = (airflow_run.get("state") or "").lower()
+    status = airflow_state if airflow_state in ["success", "failed", "running"] else current_status
+    return RunUpdate(
+        job_run_id=job_run_id,
+        status=status,
+        started_at=parse_airflow_timestamp(airflow_run.get("start_date")),
+        ended_at=parse_airflow_timestamp(airflow_run.get("end_date")),
+    )
+
+
+def bulk_apply_run_updates(db: Session, updates: List[RunUpdate]) -> List[Any]:
+    """
+    Write a batch of job run updates with one UPDATE ... FROM (VALUES ...)
+
+    The statement runs in the session's transaction; the caller commits.
+    Rows that would not change are skipped, and a finished job run is never
+    moved back to a non-terminal status.
+
+    Args:
+        db: Database session
+        updates: Updates to apply
+
+    Returns:
+        The changed rows (id, workflow_id, dag_run_id, status, started_at, ended_at)
+    """
+    if not updates:
+        return []
+
+    v = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("status", String),
+        column("started_at", DateTime),
+        column("ended_at", DateTime),
+        name="v",
+    ).data([tuple(u) for u in updates])
+
+    started_at = func.coalesce(cast(v.c.started_at, DateTime), JobRun.started_at)
+    ended_at = func.coalesce(cast(v.c.ended_at, DateTime), JobRun.ended_at)
+    stmt = (
+        update(JobRun)
+        .where(
+            JobRun.id == v.c.id,
+            not_(and_(
+                JobRun.status.notin_(NON_TERMINAL_STATES),
+                v.c.status.in_(NON_TERMINAL_STATES),
+            )),
+            or_(
+                JobRun.status.is_distinct_from(v.c.status),
+                JobRun.started_at.is_distinct_from(started_at),
+                JobRun.ended_at.is_distinct_from(ended_at),
+            ),
+        )
+        .values(status=v.c.status, started_at=started_at, ended_at=ended_at)
+        .returning(
+            JobRun.id,
+            JobRun.workflow_id,
+            JobRun.dag_run_id,
+            JobRun.status,
+            JobRun.started_at,
+            JobRun.ended_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).all()
+
+
+def publish_status_changes(changed: List[Any], previous_status: Dict[Any, str]) -> None:
+    """
+    Publish run.status_changed events for rows returned by bulk_apply_run_updates
+
+    Call after the transaction has been committed.
+
+    Args:
+        changed: Rows returned by bulk_apply_run_updates
+        previous_status: Status before the update, keyed by job run id
+    """
+    for row in changed:
+        if row.status != previous_status.get(row.id):
+            publish_run_event("run.status_changed", row)
+
+
+def publish_run_event(event_type: str, job_run: Any) -> None:
+    """Publish a job run delta to the change feed and wake its long-poll waiters"""
+    run_waiters.notify(job_run.id)
+    change_feed.publish(event_type, {
+        "job_run_id": str(job_run.id),
+        "workflow_id": str(job_run.workflow_id),
+        "dag_run_id": job_run.dag_run_id,
+        "status": job_run.status,
+        "started_at": job_run.started_at.isoformat() if job_run.started_at else None,
+        "ended_at": job_run.ended_at.isoformat() if job_run.ended_at else None,
+    })
+
+
+def apply_run_update(job_run: JobRun, run_update: RunUpdate) -> None:
+    """Mirror a written RunUpdate onto an in-memory (detached) job run"""
+    if job_run.status not in NON_TERMINAL_STATES and run_update.status in NON_TERMINAL_STATES:
+        return
+    job_run.status = run_update.status
+    if run_update.started_at is not None:
+        job_run.started_at = run_update.started_at
+    if run_update.ended_at is not None:
+        job_run.ended_at = run_update.ended_at
+
@@ -0,0 +1,137 @@
+"""
+Long-poll support for job runs
+Requests waiting on a job run park on one shared asyncio.Event per run, set
+when the run's state is published (reconciler, pushed events, inline sync)
+"""
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from app.core.config import settings
+
+
+class _RunWatch:
+    """Waiters and the optional upstream poller for one job run"""
+
+    __slots__ = ("waiters", "changed", "poller")
+
+    def __init__(self):
+        self.waiters = 0
+        self.changed = asyncio.Event()
+        self.poller: Optional[asyncio.Task] = None
+
+
+class RunWaiters:
+    """
+    Registry of requests waiting for job run state changes
+
+    notify() may be called from worker threads (sync endpoints); waiters are
+    woken on the event loop.
+    """
+
+    def __init__(self, poll_interval: float = settings.RUN_RECONCILER_INTERVAL):
+        self.poll_interval = poll_interval
+        self._watches: Dict[Any, _RunWatch] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.notifications = 0
+        self.poll_errors = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach the event loop waiters run on (called from the app lifespan)"""
+        self._loop = loop
+
+    def notify(self, job_run_id: Any) -> None:
+        """Wake everything waiting on a job run"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake(job_run_id)
+        else:
+            loop.call_soon_threadsafe(self._wake, job_run_id)
+
+    def _wake(self, job_run_id: Any) -> None:
+        watch = self._watches.get(job_run_id)
+        if watch is None:
+            return
+        self.notifications += 1
+        changed, watch.changed = watch.changed, asyncio.Event()
+        changed.set()
+
+    @contextmanager
+    def watch(
+        self,
+        job_run_id: Any,
+        poll: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Iterator[None]:
+        """
+        Register a waiter on a job run for the duration of the block
+
+        Args:
+            job_run_id: Job run to wait on
+            poll: Upstream check run every poll_interval while anyone waits
+                (shared by all waiters on the run); None when state is already
+                kept fresh by the reconciler or pushed events
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        watch = self._watches.get(job_run_id)
+        if watch is None:
+            watch = self._watches[job_run_id] = _RunWatch()
+        watch.waiters += 1
+        if poll is not None and watch.poller is None:
+            # Fresh context: the poller outlives this request's Airflow deadline
+            watch.poller = asyncio.create_task(self._poll(poll), context=contextvars.Context())
+        try:
+            yield
+        finally:
+            watch.waiters -= 1
+            if watch.waiters == 0:
+                if watch.poller is not None:
+                    watch.poller.cancel()
+                del self._watches[job_run_id]
+
+    def changed(self, job_run_id: Any) -> asyncio.Event:
+        """
+        Event set on the next state change of a watched job run
+
+        Take it before reading the run's state, so a change published in
+        between is not missed.
+        """
+        return self._watches[job_run_id].changed
+
+    async def _poll(self, poll: Callable[[], Awaitable[Any]]) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.poll_errors += 1
+                print(f"Job run wait poll failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get waiter counters
+
+        Returns:
+            Dict with watched runs, open waiters and poller counts
+        """
+        return {
+            "watched_runs": len(self._watches),
+            "waiters": sum(watch.waiters for watch in self._watches.values()),
+            "pollers": sum(1 for watch in self._watches.values() if watch.poller is not None),
+            "notifications": self.notifications,
+            "poll_errors": self.poll_errors,
+        }
+
+
+# Process-wide registry shared by every wait request
+run_waiters = RunWaiters()
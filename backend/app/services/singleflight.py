@@ -0,0 +1,72 @@
+"""
+Request coalescing for identical concurrent calls
+Concurrent callers asking for the same key share one in-flight call
+"""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    def __init__(self, context_factory: Callable[[], contextvars.Context] = contextvars.Context):
+        """
+        Initialize the coalescer
+
+        Args:
+            context_factory: Builds the context each shared call runs in
+                (default: empty, so it isn't bound to the first caller's state)
+        """
+        self.context_factory = context_factory
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers using the same key
+
+        The shared call runs in its own task and context, so a caller that gets
+        cancelled (e.g. client disconnect) does not cancel it for the others,
+        and it is not bound to the first caller's context (e.g. its deadline).
+
+        Args:
+            key: Identity of the call (e.g. request URL)
+            fn: Coroutine factory performing the call
+
+        Returns:
+            The result of the shared call (exceptions are shared as well)
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.create_task(fn(), context=self.context_factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished call so the next caller starts a new one"""
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters
+
+        Returns:
+            Dict with call, execution and collapsed counts
+        """
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+        }
@@ -0,0 +1,132 @@
+"""
+Per-task run records synced from Airflow task instances
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.task_run import TaskRun
+from app.services.airflow_client import AirflowClient
+from app.services.airflow_metadata import get_airflow_metadata
+from app.services.run_updates import parse_airflow_timestamp
+
+
+def task_run_row(
+    job_run_id: Any,
+    task_instance: Dict[str, Any],
+    queued_key: str = "queued_when"
+) -> Dict[str, Any]:
+    """
+    Build a task_runs row from an Airflow task instance (or pushed event)
+
+    Args:
+        job_run_id: Job run the task belongs to
+        task_instance: Task instance payload
+        queued_key: Field holding the queue time ("queued_when" in the REST API)
+
+    Returns:
+        Column values for bulk_upsert_task_runs
+    """
+    return {
+        "job_run_id": job_run_id,
+        "task_id": task_instance["task_id"],
+        "state": task_instance.get("state"),
+        "try_number": task_instance.get("try_number") or 0,
+        "queued_at": parse_airflow_timestamp(task_instance.get(queued_key)),
+        "started_at": parse_airflow_timestamp(task_instance.get("start_date")),
+        "ended_at": parse_airflow_timestamp(task_instance.get("end_date")),
+        "duration": task_instance.get("duration"),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def bulk_upsert_task_runs(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert or update task_runs rows with one INSERT ... ON CONFLICT statement
+
+    An older try never overwrites a newer one. The caller commits.
+
+    Args:
+        db: Database session
+        rows: Rows built by task_run_row
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    # Postgres rejects a statement that touches the same conflict key twice
+    deduped: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["job_run_id"], row["task_id"])
+        current = deduped.get(key)
+        if current is None or row["try_number"] >= current["try_number"]:
+            deduped[key] = row
+
+    stmt = insert(TaskRun).values(list(deduped.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_task_runs_job_run_task",
+        set_={
+            "state": stmt.excluded.state,
+            "try_number": stmt.excluded.try_number,
+            "queued_at": stmt.excluded.queued_at,
+            "started_at": stmt.excluded.started_at,
+            "ended_at": stmt.excluded.ended_at,
+            "duration": stmt.excluded.duration,
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=stmt.excluded.try_number >= TaskRun.try_number,
+    )
+    result = db.execute(stmt)
+    return result.rowcount
+
+
+async def fetch_task_run_rows(
+    airflow: AirflowClient,
+    job_runs: Iterable[Any]
+) -> List[Dict[str, Any]]:
+    """
+    Fetch task instances for a set of job runs in one batch lookup
+
+    Reads Airflow's task_instance table directly when AIRFLOW_STATE_SOURCE
+    is "database", otherwise (or if that fails) uses the REST batch endpoint.
+
+    Args:
+        airflow: Airflow client
+        job_runs: Objects with id, workflow_id and dag_run_id attributes
+
+    Returns:
+        task_runs rows for bulk_upsert_task_runs
+    """
+    by_key = {
+        (f"workflow_{jr.workflow_id}", jr.dag_run_id): jr.id
+        for jr in job_runs
+        if jr.dag_run_id
+    }
+    if not by_key:
+        return []
+
+    task_instances = None
+    metadata = get_airflow_metadata()
+    if metadata is not None:
+        try:
+            task_instances = await asyncio.to_thread(metadata.get_task_instances, list(by_key))
+        except Exception as e:
+            print(f"Failed to read task instances from Airflow's database, using the REST API: {e}")
+
+    if task_instances is None:
+        task_instances = await airflow.list_task_instances_batch(
+            dag_ids=sorted({dag_id for dag_id, _ in by_key}),
+            dag_run_ids=sorted({run_id for _, run_id in by_key}),
+        )
+
+    rows = []
+    for ti in task_instances:
+        job_run_id: Optional[Any] = by_key.get((ti.get("dag_id"), ti.get("dag_run_id")))
+        if job_run_id is not None:
+            rows.append(task_run_row(job_run_id, ti))
+    return rows
@@ -0,0 +1,225 @@
+"""
+MLOps workflow DAG runtime
+Builds a workflow's Airflow DAG from its spec (the values of
+DAGGenerator.template_context). This is the only implementation of task
+construction: the Jinja templates copy it into every generated DAG file and
+into the DAG factory, and the backend loads it to validate a workflow before
+publishing it.
+
+Airflow is imported inside build_dag only, so the backend can load this file.
+It is included verbatim by Jinja: keep it free of Jinja delimiters.
+"""
+import re
+from datetime import datetime, timedelta
+from functools import partial
+
+# Airflow's rule for task IDs
+TASK_ID_PATTERN = re.compile(r"^[\w.-]{1,250}$")
+
+GIT_TASK_FIELDS = ("git_repository", "script_path", "function_name", "docker_image")
+
+
+def serialize_for_xcom(obj):
+    """Make numpy results XCom-serializable"""
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None and isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, dict):
+        return {k: serialize_for_xcom(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [serialize_for_xcom(item) for item in obj]
+    return obj
+
+
+def run_inline(user_code, task_id, /, **context):
+    """Inline code task: executes the task's Python code in the Airflow worker"""
+    # Create a local namespace for execution
+    local_vars = {'context': context, '__builtins__': __builtins__}
+
+    # Execute the user code
+    exec(user_code, local_vars)
+
+    # If user defined a function with the same name as task_id, call it
+    if task_id in local_vars and callable(local_vars[task_id]):
+        result = local_vars[task_id]()
+        # Serialize result if it contains numpy arrays
+        if result is not None:
+            result = serialize_for_xcom(result)
+        return result
+
+
+def git_command(task):
+    """Shell command of a Git-based task: clone, install requirements, call the function"""
+    if task["git_commit_sha"]:
+        # Specific commit SHA provided - clone and checkout that commit
+        clone = (
+            f"git clone {task['git_repository']} /workspace\n"
+            f"cd /workspace\n"
+            f"git checkout {task['git_commit_sha']}\n"
+            f"echo \"Checked out commit: {task['git_commit_sha']}\"\n"
+        )
+    else:
+        # No commit SHA - use latest from branch
+        clone = (
+            f"git clone --depth 1 --branch {task['git_branch']} {task['git_repository']} /workspace\n"
+            f"cd /workspace\n"
+            f"echo \"Using latest from branch: {task['git_branch']}\"\n"
+        )
+
+    requirements = ""
+    if task["script_path"].endswith(".txt") or "requirements" in task["script_path"]:
+        requirements = (
+            "echo \"=== Installing requirements ===\"\n"
+            "if [ -f requirements.txt ]; then\n"
+            "    pip install -q -r requirements.txt\n"
+            "fi\n"
+        )
+
+    module = task["script_path"].replace("/", ".").replace(".py", "")
+    function = task["function_name"]
+    return [
+        "sh", "-c",
+        "set -e\n"
+        "echo \"=== Installing git ===\"\n"
+        "apt-get update -qq && apt-get install -y -qq git > /dev/null 2>&1\n"
+        "echo \"=== Cloning Git repository ===\"\n"
+        f"{clone}"
+        "echo \"=== Repository cloned successfully ===\"\n"
+        "ls -la\n"
+        f"{requirements}"
+        "echo \"=== Executing Python function ===\"\n"
+        "python3 -c \"\n"
+        "import sys\n"
+        "sys.path.insert(0, '/workspace')\n"
+        f"from {module} import {function}\n"
+        f"print('Calling {function}...')\n"
+        f"result = {function}()\n"
+        "print(f'Result: {result}')\n"
+        "\"\n"
+        "echo \"=== Task completed successfully ===\"\n"
+    ]
+
+
+def validate_workflow(workflow):
+    """
+    Check that a workflow spec can be built into a DAG
+
+    Raises:
+        ValueError: Listing every problem found (bad or duplicate task IDs,
+            missing Git task fields, unknown or cyclic dependencies)
+    """
+    problems = []
+    task_ids = [task["task_id"] for task in workflow["tasks"]]
+    if not task_ids:
+        problems.append("workflow has no tasks")
+
+    seen = set()
+    for task in workflow["tasks"]:
+        task_id = task["task_id"]
+        if not TASK_ID_PATTERN.match(task_id):
+            problems.append(f"task ID '{task_id}' may only contain letters, digits, '_', '.' and '-' (1-250 chars)")
+        if task_id in seen:
+            problems.append(f"task ID '{task_id}' is used more than once")
+        seen.add(task_id)
+
+        if task["execution_mode"] == "git":
+            for field in GIT_TASK_FIELDS:
+                if not task[field]:
+                    problems.append(f"Git task '{task_id}' has no {field}")
+            if not task["git_commit_sha"] and not task["git_branch"]:
+                problems.append(f"Git task '{task_id}' has neither git_branch nor git_commit_sha")
+
+        for dep in task["dependencies"]:
+            if dep not in task_ids:
+                problems.append(f"task '{task_id}' depends on unknown task '{dep}'")
+
+    # Depth-first search for a dependency cycle
+    upstream = {task["task_id"]: [dep for dep in task["dependencies"] if dep in seen] for task in workflow["tasks"]}
+    state = {}
+
+    def visit(task_id, path):
+        if state.get(task_id) == "done":
+            return None
+        if state.get(task_id) == "visiting":
+            return path[path.index(task_id):] + [task_id]
+        state[task_id] = "visiting"
+        for dep in upstream[task_id]:
+            cycle = visit(dep, path + [task_id])
+            if cycle:
+                return cycle
+        state[task_id] = "done"
+        return None
+
+    for task_id in upstream:
+        cycle = visit(task_id, [])
+        if cycle:
+            problems.append(f"dependency cycle: {' <- '.join(cycle)}")
+            break
+
+    if problems:
+        raise ValueError("; ".join(problems))
+
+
+def build_dag(workflow):
+    """Build the DAG of one workflow spec"""
+    from airflow import DAG
+    from airflow.operators.python import PythonOperator
+
+    validate_workflow(workflow)
+
+    default_args = {
+        'owner': 'mlops',
+        'depends_on_past': False,
+        'start_date': datetime(2024, 1, 1),
+        'email_on_failure': False,
+        'email_on_retry': False,
+        'retries': 0,
+    }
+
+    with DAG(
+        dag_id=f"workflow_{workflow['workflow_id']}",
+        default_args=default_args,
+        description=workflow['workflow_description'],
+        schedule_interval=workflow['schedule'],
+        start_date=datetime(2024, 1, 1),
+        catchup=False,
+        tags=['mlops', 'auto-generated', workflow['workflow_name']]
+    ) as dag:
+        operators = {}
+        for task in workflow['tasks']:
+            if task['execution_mode'] == 'git':
+                # Git-based task: executes Python function from Git repository in Docker
+                # (only imported when a workflow has Git tasks)
+                from airflow.providers.docker.operators.docker import DockerOperator
+
+                operators[task['task_id']] = DockerOperator(
+                    task_id=task['task_id'],
+                    image=task['docker_image'],
+                    api_version='auto',
+                    auto_remove=True,
+                    command=git_command(task),
+                    docker_url='unix://var/run/docker.sock',
+                    network_mode='bridge',
+                    mount_tmp_dir=False,
+                    retries=task['retry_count'],
+                    retry_delay=timedelta(seconds=task['retry_delay']),
+                )
+            else:
+                # Inline code task: executes Python code directly in Airflow worker
+                operators[task['task_id']] = PythonOperator(
+                    task_id=task['task_id'],
+                    python_callable=partial(run_inline, task['python_callable'], task['task_id']),
+                    op_kwargs=task['params'],
+                    retries=task['retry_count'],
+                    retry_delay=timedelta(seconds=task['retry_delay']),
+                )
+
+        # Task Dependencies
+        for task in workflow['tasks']:
+            for dep in task['dependencies']:
+                operators[dep] >> operators[task['task_id']]
+
+    return dag
@@ -0,0 +1,87 @@
+"""
+Benchmark: Airflow parse time of the two DAG deploy modes
+Publishes 10, 100 and 1000 workflows (5 tasks each) as one DAG file per
+workflow ("files") and as the DAG factory plus snapshot ("factory"), then
+times a full DagBag load of each dags folder
+
+Must run where Airflow is installed, e.g. in the scheduler image:
+    docker compose -f docker/docker-compose.yml run --rm --no-deps -v "$PWD:/work" -w /work \
+        --entrypoint python airflow-scheduler benchmark_dag_parse.py
+"""
+import importlib.util
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+from airflow.models.dagbag import DagBag
+
+# Load the generator straight from its file: the app package's imports
+# (settings, database layer) are not available in the Airflow image
+GENERATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend", "app", "services", "dag_generator.py")
+spec = importlib.util.spec_from_file_location("dag_generator", GENERATOR_PATH)
+dag_generator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(dag_generator)
+
+TASKS_PER_WORKFLOW = 5
+WARM_REPEAT = 2
+
+
+def make_workflow(index):
+    workflow = SimpleNamespace(
+        id=uuid.uuid4(),
+        name=f"bench_{index}",
+        description="Parse benchmark",
+        schedule="@daily",
+    )
+    tasks = [
+        SimpleNamespace(
+            name=f"task_{i}",
+            execution_mode="inline",
+            python_callable=f"def task_{i}():\n    return {i}\n",
+            git_repository=None,
+            git_branch=None,
+            git_commit_sha=None,
+            script_path=None,
+            function_name=None,
+            docker_image=None,
+            params={"index": i},
+            retry_count=1,
+            retry_delay=60,
+            dependencies=[f"task_{i - 1}"] if i else [],
+        )
+        for i in range(TASKS_PER_WORKFLOW)
+    ]
+    return workflow, tasks
+
+
+def parse(dags_folder):
+    """Seconds to load a dags folder into a DagBag, with its DAG and import error counts"""
+    started = time.perf_counter()
+    dagbag = DagBag(dag_folder=dags_folder, include_examples=False)
+    return time.perf_counter() - started, len(dagbag.dags), len(dagbag.import_errors)
+
+
+def main():
+    print(f"{'workflows':>9} {'mode':>8} {'cold (s)':>9} {'warm (s)':>9} {'dags':>6} {'errors':>6}")
+    for workflow_count in (10, 100, 1000):
+        workflows = [make_workflow(i) for i in range(workflow_count)]
+
+        with tempfile.TemporaryDirectory() as files_folder, tempfile.TemporaryDirectory() as factory_folder:
+            files_gen = dag_generator.DAGGenerator(files_folder)
+            for workflow, tasks in workflows:
+                files_gen.publish_dag(str(workflow.id), files_gen.generate_dag_code(workflow, tasks))
+
+            factory_gen = dag_generator.DAGGenerator(factory_folder, mode="factory")
+            factory_gen.publish_snapshot(factory_gen.snapshot_entry(workflow, tasks) for workflow, tasks in workflows)
+
+            for mode, folder in (("files", files_folder), ("factory", factory_folder)):
+                # Cold: what a freshly forked DAG processor pays; warm: repeat loads in one process
+                cold, dags, errors = parse(folder)
+                warm = min(parse(folder)[0] for _ in range(WARM_REPEAT))
+                print(f"{workflow_count:>9} {mode:>8} {cold:>9.3f} {warm:>9.3f} {dags:>6} {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Microbenchmark: DAG render cost per deploy
+Compares building a DAGGenerator per request (mkdir + template read + compile
+on every deploy, the old get_dag_generator) with the shared generator whose
+compiled template is cached, for workflows with 10, 100 and 1000 tasks
+
+Usage:
+    cd backend && python ../benchmark_dag_render.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from app.services.dag_generator import DAGGenerator, TEMPLATES_DIR, DAG_TEMPLATE_NAME  # noqa: E402
+
+REPEAT = 5
+
+
+def make_workflow(task_count):
+    workflow = SimpleNamespace(
+        id=uuid.uuid4(),
+        name=f"bench_{task_count}",
+        description="Render benchmark",
+        schedule="@daily",
+    )
+    tasks = [
+        SimpleNamespace(
+            name=f"task_{i}",
+            execution_mode="inline",
+            python_callable=f"def run(**context):\n    return {i}\n",
+            git_repository=None,
+            git_branch=None,
+            git_commit_sha=None,
+            script_path=None,
+            function_name=None,
+            docker_image=None,
+            params={"index": i},
+            retry_count=1,
+            retry_delay=60,
+            dependencies=[f"task_{i - 1}"] if i else [],
+        )
+        for i in range(task_count)
+    ]
+    return workflow, tasks
+
+
+class PerRequestGenerator(DAGGenerator):
+    """The old behaviour: template file read and compiled for every generator"""
+
+    def __init__(self, dags_folder):
+        super().__init__(dags_folder=dags_folder)
+        environment = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+        self._template = environment.get_template(DAG_TEMPLATE_NAME)
+
+    @property
+    def template(self):
+        return self._template
+
+
+def render_per_request(dags_folder, workflow, tasks):
+    """What every deploy paid before: a fresh generator (mkdir, read, compile) per request"""
+    return PerRequestGenerator(dags_folder).generate_dag_code(workflow, tasks)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as dags_folder:
+        shared = DAGGenerator(dags_folder=dags_folder)
+        shared.generate_dag_code(*make_workflow(1))  # Warm the template cache
+
+        print(f"{'tasks':>6} {'per-request (ms)':>18} {'shared (ms)':>12} {'speedup':>8}")
+        for task_count in (10, 100, 1000):
+            workflow, tasks = make_workflow(task_count)
+            number = max(1, 1000 // task_count)
+
+            before = min(timeit.repeat(
+                lambda: render_per_request(dags_folder, workflow, tasks), number=number, repeat=REPEAT
+            )) / number
+            after = min(timeit.repeat(
+                lambda: shared.generate_dag_code(workflow, tasks), number=number, repeat=REPEAT
+            )) / number
+
+            print(f"{task_count:>6} {before * 1000:>18.3f} {after * 1000:>12.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
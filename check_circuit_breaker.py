@@ -0,0 +1,81 @@
+"""
+Check: a half-open circuit breaker recovers when its probe call never finishes
+Opens the breaker against a fake Airflow, lets the recovery timeout pass, then
+cancels the probe request mid-flight (as a client disconnect or wait_for
+timeout would) and asserts the next call is allowed to probe and closes it.
+
+Usage:
+    cd backend && python ../check_circuit_breaker.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import httpx  # noqa: E402
+
+from app.services.airflow_client import AirflowClient  # noqa: E402
+from app.services.resilience import CircuitBreaker, CircuitOpenError  # noqa: E402
+
+RECOVERY_TIMEOUT = 0.05
+
+
+class FakeAirflow:
+    """Answers GET /dags/{id}: unreachable, hanging or healthy"""
+
+    def __init__(self):
+        self.mode = "down"
+
+    async def handle(self, request):
+        if self.mode == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        if self.mode == "hang":
+            await asyncio.Event().wait()
+        return httpx.Response(200, json={"dag_id": "workflow_check", "is_paused": False})
+
+
+async def main():
+    fake = FakeAirflow()
+    airflow = AirflowClient(
+        base_url="http://airflow.invalid/api/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(fake.handle)),
+    )
+    airflow.breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=RECOVERY_TIMEOUT)
+    url = f"{airflow.base_url}/dags/workflow_check"
+
+    try:
+        # Open the circuit
+        try:
+            await airflow._request("GET", url, retry=False)
+        except httpx.ConnectError:
+            pass
+        assert airflow.breaker.state == CircuitBreaker.OPEN, airflow.breaker.state
+
+        # The probe hangs and its caller gives up
+        await asyncio.sleep(RECOVERY_TIMEOUT)
+        fake.mode = "hang"
+        probe = asyncio.create_task(airflow._request("GET", url, retry=False))
+        await asyncio.sleep(0.01)
+        assert airflow.breaker.state == CircuitBreaker.HALF_OPEN, airflow.breaker.state
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+
+        # The next call must be let through as the new probe, not refused forever
+        fake.mode = "up"
+        try:
+            await airflow._request("GET", url, retry=False)
+        except CircuitOpenError:
+            raise AssertionError("Breaker stuck half-open after a cancelled probe")
+        assert airflow.breaker.state == CircuitBreaker.CLOSED, airflow.breaker.state
+    finally:
+        await airflow.aclose()
+
+    print("[OK] Cancelled half-open probe released; next call closed the circuit")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -62,6 +62,7 @@ function TaskEditor({ workflowId, task, tasks, open, onClose }: TaskEditorProps)
     onSuccess: () => {
       message.success('Task created successfully');
       queryClient.invalidateQueries({ queryKey: ['tasks', workflowId] });
+      queryClient.invalidateQueries({ queryKey: ['workflow', workflowId] });
       onClose();
     },
     onError: (error: any) => {
@@ -76,6 +77,7 @@ function TaskEditor({ workflowId, task, tasks, open, onClose }: TaskEditorProps)
     onSuccess: () => {
       message.success('Task updated successfully');
       queryClient.invalidateQueries({ queryKey: ['tasks', workflowId] });
+      queryClient.invalidateQueries({ queryKey: ['workflow', workflowId] });
       onClose();
     },
     onError: (error: any) => {
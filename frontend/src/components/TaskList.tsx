@@ -31,6 +31,7 @@ function TaskList({ tasks, loading, onEdit, workflowId }: TaskListProps) {
     onSuccess: () => {
       message.success('Task deleted successfully');
       queryClient.invalidateQueries({ queryKey: ['tasks', workflowId] });
+      queryClient.invalidateQueries({ queryKey: ['workflow', workflowId] });
     },
     onError: (error: any) => {
       message.error(error.response?.data?.detail || 'Failed to delete task');
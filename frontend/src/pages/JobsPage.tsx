@@ -1,5 +1,5 @@
-import { useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useEffect, useState } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import {
   Card,
   Table,
@@ -20,7 +20,7 @@ import {
   EyeOutlined,
   PlayCircleOutlined,
 } from '@ant-design/icons';
-import { jobApi, workflowApi, monitoringApi, type JobRun } from '@/services/api';
+import { jobApi, workflowApi, monitoringApi, subscribeToChanges, type JobRun } from '@/services/api';
 import LogViewer from '@/components/LogViewer';
 import dayjs from 'dayjs';
 import duration from 'dayjs/plugin/duration';
@@ -33,12 +33,23 @@ function JobsPage() {
   const [statusFilter, setStatusFilter] = useState<string | undefined>();
   const [selectedJobRun, setSelectedJobRun] = useState<JobRun | undefined>();
   const [isLogModalOpen, setIsLogModalOpen] = useState(false);
+  const queryClient = useQueryClient();
+
+  // Refetch when the backend pushes a change instead of polling
+  useEffect(() => {
+    return subscribeToChanges((event) => {
+      if (event.type.startsWith('run.') || event.type === 'reset') {
+        queryClient.invalidateQueries({ queryKey: ['jobs'] });
+        queryClient.invalidateQueries({ queryKey: ['stats'] });
+      }
+    });
+  }, [queryClient]);
 
   // Fetch jobs
   const { data: jobsData, isLoading: jobsLoading } = useQuery({
     queryKey: ['jobs', statusFilter],
     queryFn: () => jobApi.list({ status_filter: statusFilter, limit: 100 }),
-    refetchInterval: 5000, // Auto-refresh every 5 seconds
+    refetchInterval: 60000, // Fallback; changes arrive over the event stream
   });
 
   // Fetch workflows for mapping
@@ -51,7 +62,7 @@ function JobsPage() {
   const { data: stats } = useQuery({
     queryKey: ['stats'],
     queryFn: monitoringApi.stats,
-    refetchInterval: 10000,
+    refetchInterval: 60000,
   });
 
   const getWorkflowName = (workflowId: string) => {
@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import {
@@ -23,7 +23,7 @@ import {
   PlusOutlined,
   ArrowLeftOutlined,
 } from '@ant-design/icons';
-import { workflowApi, taskApi, jobApi, type Task } from '@/services/api';
+import { workflowApi, jobApi, type Task } from '@/services/api';
 import TaskList from '@/components/TaskList';
 import TaskEditor from '@/components/TaskEditor';
 import TaskGraph from '@/components/TaskGraph';
@@ -36,21 +36,16 @@ function WorkflowDetailPage() {
   const [isEditModalOpen, setIsEditModalOpen] = useState(false);
   const [isTaskEditorOpen, setIsTaskEditorOpen] = useState(false);
   const [editingTask, setEditingTask] = useState<Task | undefined>();
+  const [deployId, setDeployId] = useState<string | undefined>();
   const [form] = Form.useForm();
 
-  // Fetch workflow
-  const { data: workflow, isLoading: workflowLoading } = useQuery({
+  // Fetch workflow, tasks and recent runs in one request
+  const { data: workflow, isLoading: workflowLoading, isFetching: tasksLoading } = useQuery({
     queryKey: ['workflow', id],
-    queryFn: () => workflowApi.get(id!),
-    enabled: !!id,
-  });
-
-  // Fetch tasks
-  const { data: tasks, isLoading: tasksLoading } = useQuery({
-    queryKey: ['tasks', id],
-    queryFn: () => taskApi.list(id!),
+    queryFn: () => workflowApi.overview(id!),
     enabled: !!id,
   });
+  const tasks = workflow?.tasks;
 
   // Update workflow mutation
   const updateMutation = useMutation({
@@ -66,18 +61,41 @@ function WorkflowDetailPage() {
     },
   });
 
-  // Deploy workflow mutation
+  // Deploy workflow mutation (starts a background deploy)
   const deployMutation = useMutation({
     mutationFn: workflowApi.deploy,
     onSuccess: (data) => {
-      message.success(`Workflow deployed! DAG ID: ${data.dag_id}`);
-      queryClient.invalidateQueries({ queryKey: ['workflow', id] });
+      message.info(`Deploying ${data.dag_id}...`);
+      setDeployId(data.id);
     },
     onError: (error: any) => {
       message.error(error.response?.data?.detail || 'Failed to deploy workflow');
     },
   });
 
+  // Poll the deploy until it finishes
+  const { data: deploy } = useQuery({
+    queryKey: ['deploy', deployId],
+    queryFn: () => workflowApi.getDeploy(deployId!),
+    enabled: !!deployId,
+    refetchInterval: (query) => {
+      const status = query.state.data?.status;
+      return status === 'pending' || status === 'running' ? 2000 : false;
+    },
+  });
+  const isDeploying = deploy?.status === 'pending' || deploy?.status === 'running';
+
+  useEffect(() => {
+    if (!deploy || isDeploying) return;
+    if (deploy.status === 'succeeded') {
+      message.success(`Workflow deployed! DAG ID: ${deploy.dag_id}`);
+    } else {
+      message.error(deploy.error || `Deploy ${deploy.status}`);
+    }
+    setDeployId(undefined);
+    queryClient.invalidateQueries({ queryKey: ['workflow', id] });
+  }, [deploy, isDeploying, id, queryClient]);
+
   // Trigger workflow mutation
   const triggerMutation = useMutation({
     mutationFn: jobApi.trigger,
@@ -173,7 +191,7 @@ function WorkflowDetailPage() {
               type="primary"
               icon={<RocketOutlined />}
               onClick={handleDeploy}
-              loading={deployMutation.isPending}
+              loading={deployMutation.isPending || isDeploying}
             >
               Deploy
             </Button>
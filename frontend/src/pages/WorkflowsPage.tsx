@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import {
@@ -27,7 +27,7 @@ import {
   PauseCircleOutlined,
   QuestionCircleOutlined,
 } from '@ant-design/icons';
-import { workflowApi, type Workflow, type WorkflowCreate } from '@/services/api';
+import { workflowApi, subscribeToChanges, type Workflow, type WorkflowCreate } from '@/services/api';
 import dayjs from 'dayjs';
 import relativeTime from 'dayjs/plugin/relativeTime';
 
@@ -39,11 +39,20 @@ function WorkflowsPage() {
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [form] = Form.useForm();
 
+  // Refetch when a workflow is paused or unpaused anywhere
+  useEffect(() => {
+    return subscribeToChanges((event) => {
+      if (event.type.startsWith('workflow.') || event.type === 'reset') {
+        queryClient.invalidateQueries({ queryKey: ['workflows'] });
+      }
+    });
+  }, [queryClient]);
+
   // Fetch workflows
   const { data: workflows, isLoading } = useQuery({
     queryKey: ['workflows'],
     queryFn: workflowApi.list,
-    refetchInterval: 5000, // Auto-refresh every 5 seconds to sync with Airflow
+    refetchInterval: 60000, // Fallback for changes made directly in Airflow
   });
 
   // Create workflow mutation
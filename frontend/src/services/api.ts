@@ -17,6 +17,7 @@ export interface Workflow {
   schedule?: string;
   is_active: boolean;
   is_paused_in_airflow?: boolean;
+  dag_hash?: string | null;
   created_at: string;
   updated_at: string;
 }
@@ -104,6 +105,32 @@ export interface JobRunList {
   job_runs: JobRun[];
   page: number;
   page_size: number;
+  total_is_estimate: boolean;
+  next_cursor?: string | null;
+}
+
+export interface WorkflowOverview extends Workflow {
+  tasks: Task[];
+  recent_runs: JobRun[];
+  run_counts: Record<string, number>;
+}
+
+export type DeployStatus = 'pending' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+
+export interface Deploy {
+  id: string;
+  workflow_id: string;
+  dag_id: string;
+  dag_file: string;
+  status: DeployStatus;
+  phase: 'rendered' | 'written' | 'parsed' | 'unpaused' | null;
+  phases: Record<string, string | null>;
+  error: string | null;
+  import_error: string | null;
+  content_hash: string | null;
+  changed: boolean | null;
+  created_at: string;
+  finished_at: string | null;
 }
 
 export interface Stats {
@@ -117,6 +144,13 @@ export interface Stats {
     recent_24h: number;
     by_status: Record<string, number>;
     success_rate: number;
+    window: {
+      range: string;
+      since: string;
+      total: number;
+      by_status: Record<string, number>;
+      success_rate: number;
+    };
   };
 }
 
@@ -132,6 +166,13 @@ export const workflowApi = {
     return response.data;
   },
 
+  overview: async (id: string, runsLimit = 10): Promise<WorkflowOverview> => {
+    const response = await apiClient.get(`/api/v1/workflows/${id}/overview`, {
+      params: { runs_limit: runsLimit },
+    });
+    return response.data;
+  },
+
   create: async (data: WorkflowCreate): Promise<Workflow> => {
     const response = await apiClient.post('/api/v1/workflows/', data);
     return response.data;
@@ -146,11 +187,16 @@ export const workflowApi = {
     await apiClient.delete(`/api/v1/workflows/${id}`);
   },
 
-  deploy: async (id: string): Promise<{ message: string; dag_id: string; dag_file: string }> => {
+  deploy: async (id: string): Promise<Deploy> => {
     const response = await apiClient.post(`/api/v1/workflows/${id}/deploy`);
     return response.data;
   },
 
+  getDeploy: async (deployId: string): Promise<Deploy> => {
+    const response = await apiClient.get(`/api/v1/workflows/deploys/${deployId}`);
+    return response.data;
+  },
+
   pause: async (id: string): Promise<{ message: string; dag_id: string }> => {
     const response = await apiClient.post(`/api/v1/workflows/${id}/pause`);
     return response.data;
@@ -201,6 +247,8 @@ export const jobApi = {
     status_filter?: string;
     skip?: number;
     limit?: number;
+    cursor?: string;
+    exact_total?: boolean;
   }): Promise<JobRunList> => {
     const response = await apiClient.get('/api/v1/jobs/', { params });
     return response.data;
@@ -238,4 +286,36 @@ export const monitoringApi = {
   },
 };
 
+// Change stream (Server-Sent Events)
+export type ChangeEventType =
+  | 'run.created'
+  | 'run.status_changed'
+  | 'workflow.paused'
+  | 'workflow.unpaused'
+  | 'reset';
+
+export interface ChangeEvent {
+  type: ChangeEventType;
+  data: Record<string, any>;
+}
+
+const CHANGE_EVENT_TYPES: ChangeEventType[] = [
+  'run.created',
+  'run.status_changed',
+  'workflow.paused',
+  'workflow.unpaused',
+  'reset',
+];
+
+// Subscribe to job run / workflow changes; returns a function that closes the stream.
+// EventSource reconnects on its own and resumes with the Last-Event-ID header.
+export const subscribeToChanges = (onEvent: (event: ChangeEvent) => void): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/api/v1/jobs/stream`);
+  const handler = (e: MessageEvent) => {
+    onEvent({ type: e.type as ChangeEventType, data: e.data ? JSON.parse(e.data) : {} });
+  };
+  CHANGE_EVENT_TYPES.forEach((type) => source.addEventListener(type, handler));
+  return () => source.close();
+};
+
 export default apiClient;
@@ -0,0 +1,193 @@
+"""
+Airflow listener plugin that pushes run state changes to the MLOps backend
+
+Hooks DAG run and task instance state changes for workflow DAGs and posts
+them in small batches to the backend's ingestion endpoint
+(POST /api/v1/jobs/events), so job runs are updated within a second
+instead of on the next status poll.
+
+Environment variables:
+    MLOPS_EVENTS_URL: Ingestion endpoint (default: http://backend:8000/api/v1/jobs/events)
+    MLOPS_EVENTS_TOKEN: Optional shared token sent as X-Events-Token
+    MLOPS_EVENTS_FLUSH_INTERVAL: Max seconds an event waits before being sent (default: 0.5)
+    MLOPS_EVENTS_BATCH_SIZE: Events per request (default: 100)
+"""
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import urllib.request
+from datetime import datetime, timezone
+
+from airflow.listeners import hookimpl
+from airflow.plugins_manager import AirflowPlugin
+
+log = logging.getLogger(__name__)
+
+EVENTS_URL = os.environ.get("MLOPS_EVENTS_URL", "http://backend:8000/api/v1/jobs/events")
+EVENTS_TOKEN = os.environ.get("MLOPS_EVENTS_TOKEN")
+FLUSH_INTERVAL = float(os.environ.get("MLOPS_EVENTS_FLUSH_INTERVAL", "0.5"))
+BATCH_SIZE = int(os.environ.get("MLOPS_EVENTS_BATCH_SIZE", "100"))
+
+# Only DAGs generated by the MLOps backend are reported
+DAG_ID_PREFIX = "workflow_"
+
+
+def _iso(value):
+    """Format an optional datetime as ISO 8601"""
+    return value.isoformat() if value else None
+
+
+class EventSender:
+    """Buffers events and posts them in batches from a background thread"""
+
+    def __init__(self, url, token=None, flush_interval=0.5, batch_size=100):
+        self.url = url
+        self.token = token
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+
+    def send(self, event):
+        """Queue one event for delivery"""
+        self._ensure_thread()
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.wake()
+
+    def wake(self):
+        """Ask the background thread to flush now"""
+        self._wakeup.set()
+
+    def flush(self):
+        """Post everything buffered so far"""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        for i in range(0, len(events), self.batch_size):
+            self._post(events[i:i + self.batch_size])
+
+    def _ensure_thread(self):
+        # Task runners fork from the scheduler, so start one thread per process
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        with self._lock:
+            self._buffer = []
+        thread = threading.Thread(target=self._loop, name="mlops-run-events", daemon=True)
+        thread.start()
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Failed to flush run state events")
+
+    def _post(self, events):
+        body = json.dumps({"events": events}).encode("utf-8")
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            method="POST",
+            headers={"Content-Type": "application/json"},
+        )
+        if self.token:
+            request.add_header("X-Events-Token", self.token)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+        except Exception as e:
+            # The backend's reconciler catches up on anything lost here
+            log.warning("Failed to post %d run state events to %s: %s", len(events), self.url, e)
+
+
+sender = EventSender(EVENTS_URL, EVENTS_TOKEN, FLUSH_INTERVAL, BATCH_SIZE)
+atexit.register(sender.flush)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _dag_run_event(dag_run, state):
+    if not dag_run.dag_id.startswith(DAG_ID_PREFIX):
+        return
+    sender.send({
+        "type": "dag_run",
+        "dag_id": dag_run.dag_id,
+        "run_id": dag_run.run_id,
+        "state": state,
+        "start_date": _iso(dag_run.start_date),
+        "end_date": _iso(dag_run.end_date),
+        "ts": _now(),
+    })
+    if state != "running":
+        # Terminal events matter most; don't leave them waiting for the timer
+        sender.wake()
+
+
+def _task_instance_event(task_instance, state):
+    if not task_instance.dag_id.startswith(DAG_ID_PREFIX):
+        return
+    sender.send({
+        "type": "task_instance",
+        "dag_id": task_instance.dag_id,
+        "run_id": task_instance.run_id,
+        "task_id": task_instance.task_id,
+        "state": state,
+        "try_number": task_instance.try_number,
+        "start_date": _iso(task_instance.start_date),
+        "end_date": _iso(task_instance.end_date),
+        "queued_at": _iso(task_instance.queued_dttm),
+        "duration": task_instance.duration,
+        "ts": _now(),
+    })
+    if state != "running":
+        # Task runner processes exit right after this hook
+        sender.flush()
+
+
+@hookimpl
+def on_dag_run_running(dag_run, msg):
+    _dag_run_event(dag_run, "running")
+
+
+@hookimpl
+def on_dag_run_success(dag_run, msg):
+    _dag_run_event(dag_run, "success")
+
+
+@hookimpl
+def on_dag_run_failed(dag_run, msg):
+    _dag_run_event(dag_run, "failed")
+
+
+@hookimpl
+def on_task_instance_running(previous_state, task_instance):
+    _task_instance_event(task_instance, "running")
+
+
+@hookimpl
+def on_task_instance_success(previous_state, task_instance):
+    _task_instance_event(task_instance, "success")
+
+
+@hookimpl
+def on_task_instance_failed(previous_state, task_instance):
+    _task_instance_event(task_instance, "failed")
+
+
+class RunStateListenerPlugin(AirflowPlugin):
+    """Registers this module as an Airflow listener"""
+
+    name = "mlops_run_state_listener"
+    listeners = [sys.modules[__name__]]
@@ -0,0 +1,65 @@
+"""
+Fake Airflow listener: push run state events to the backend ingestion endpoint
+Usage: python send_fake_run_events.py [job_run_id] [state]
+"""
+import sys
+import requests
+from datetime import datetime, timezone
+from pprint import pprint
+
+BASE_URL = "http://localhost:8000"
+API_V1 = f"{BASE_URL}/api/v1"
+EVENTS_TOKEN = None  # Set if the backend has RUN_EVENTS_TOKEN configured
+
+
+def get_job_run(job_run_id=None):
+    """Get the given job run, or the most recent one"""
+    if job_run_id:
+        response = requests.get(f"{API_V1}/jobs/{job_run_id}")
+        response.raise_for_status()
+        return response.json()
+
+    response = requests.get(f"{API_V1}/jobs/", params={"limit": 1})
+    response.raise_for_status()
+    job_runs = response.json()["job_runs"]
+    return job_runs[0] if job_runs else None
+
+
+def send_events(job_run, state):
+    """Send a running event followed by the given final state"""
+    now = datetime.now(timezone.utc).isoformat()
+    dag_id = f"workflow_{job_run['workflow_id']}"
+    events = [
+        {"type": "dag_run", "dag_id": dag_id, "run_id": job_run["dag_run_id"],
+         "state": "running", "start_date": now, "ts": now},
+        {"type": "task_instance", "dag_id": dag_id, "run_id": job_run["dag_run_id"],
+         "task_id": "fake_task", "state": state, "try_number": 1,
+         "start_date": now, "end_date": now, "duration": 0.0, "ts": now},
+        {"type": "dag_run", "dag_id": dag_id, "run_id": job_run["dag_run_id"],
+         "state": state, "start_date": now, "end_date": now, "ts": now},
+    ]
+    headers = {"X-Events-Token": EVENTS_TOKEN} if EVENTS_TOKEN else {}
+
+    print(f"\n=== Sending {len(events)} events for {job_run['dag_run_id']} ===")
+    response = requests.post(f"{API_V1}/jobs/events", json={"events": events}, headers=headers)
+    print(f"Status Code: {response.status_code}")
+    pprint(response.json())
+
+
+def main():
+    job_run_id = sys.argv[1] if len(sys.argv) > 1 else None
+    state = sys.argv[2] if len(sys.argv) > 2 else "success"
+
+    job_run = get_job_run(job_run_id)
+    if not job_run or not job_run.get("dag_run_id"):
+        print("[ERROR] No job run with an Airflow DAG run found")
+        return
+
+    send_events(job_run, state)
+
+    job_run = get_job_run(job_run["id"])
+    print(f"\nJob run {job_run['id']} status: {job_run['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Smoke test: the backend application imports and mounts every router
+Catches errors raised while a module is imported (e.g. an import shadowing
+FastAPI's Query), which otherwise only show up when the server fails to start.
+Needs the backend requirements installed, but no database or Airflow.
+
+Usage:
+    python -m pytest test_app_import.py
+    python test_app_import.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+EXPECTED_PREFIXES = (
+    "/api/v1/workflows",
+    "/api/v1/tasks",
+    "/api/v1/jobs",
+    "/api/v1/monitoring",
+)
+
+
+def test_app_imports():
+    """Import app.main and check that each API router is mounted"""
+    from app.main import app
+
+    paths = {route.path for route in app.routes}
+    for prefix in EXPECTED_PREFIXES:
+        assert any(path.startswith(prefix) for path in paths), f"no routes mounted under {prefix}"
+
+
+if __name__ == "__main__":
+    test_app_imports()
+    print("Application imports and mounts all routers")
@@ -33,6 +33,20 @@ def get_job_status(job_run_id):
     else:
         return None, None
 
+def wait_for_job(job_run_id, timeout=30):
+    """Block until the job finishes or timeout seconds pass (server-side long poll)"""
+    response = requests.get(
+        f"{API_V1}/jobs/{job_run_id}/wait",
+        params={"until": "terminal", "timeout": timeout},
+        timeout=timeout + 10
+    )
+
+    if response.status_code == 200:
+        job_run = response.json()
+        return job_run["status"], job_run
+    else:
+        return None, None
+
 def get_task_logs(job_run_id, task_name):
     """Get task execution logs"""
     print(f"\n=== Getting Logs for Task: {task_name} ===")
@@ -63,12 +77,12 @@ def main():
 
     # Monitor execution
     print("\n[INFO] Monitoring job execution...")
-    max_attempts = 30
+    max_attempts = 10
     attempt = 0
 
     while attempt < max_attempts:
         attempt += 1
-        status, job_data = get_job_status(job_run_id)
+        status, job_data = wait_for_job(job_run_id)
 
         if not status:
             print(f"[WARNING] Could not get job status")
@@ -83,8 +97,6 @@ def main():
             pprint(job_data)
             break
 
-        time.sleep(10)
-
     # Get logs
     print("\n" + "=" * 60)
     print("Retrieving Task Logs")